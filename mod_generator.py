@@ -10,17 +10,45 @@ import os
 import sys
 import json
 import time
+import atexit
+import hashlib
 import requests
 import subprocess
 import shutil
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from operator import attrgetter
 from dotenv import load_dotenv
 import google.generativeai as genai
+import orjson
 from colorama import init, Fore, Back, Style
-import re
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from rapidfuzz import fuzz, process
+    HAVE_RAPIDFUZZ = True
+except ImportError:  # Fall back to the Numba or pure-Python scores below
+    HAVE_RAPIDFUZZ = False
+
+try:
+    import numpy as np
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+try:
+    import requests_cache
+    HAVE_REQUESTS_CACHE = True
+except ImportError:  # Every Modrinth lookup goes to the network
+    HAVE_REQUESTS_CACHE = False
 
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
@@ -28,9 +56,84 @@ init(autoreset=True)
 # Load environment variables
 load_dotenv()
 
-@dataclass
+# Concurrent Modrinth lookups during validation
+VALIDATION_WORKERS = 8
+
+# Slugs per /projects request (keeps the query string well under URL limits)
+BULK_LOOKUP_SIZE = 100
+
+# Streamed suggestions are looked up in small bulk batches while Gemini is still writing
+PREFETCH_BATCH_SIZE = 5
+
+# token_set_ratio gives unrelated names 30-70; anything under this counts as no match,
+# as word overlap did, so popularity alone can't carry a made-up name
+FUZZY_SCORE_CUTOFF = 80
+
+# Shared by all generators so prefetching stays bounded across web sessions
+prefetch_pool = ThreadPoolExecutor(max_workers=VALIDATION_WORKERS, thread_name_prefix='modrinth-prefetch')
+
+
+# Well-known mods per loader, quoted in the Gemini prompt as naming examples
+LOADER_EXAMPLES = {
+    "fabric": (
+        "Sodium", "Lithium", "Iris Shaders", "FerriteCore", "LazyDFU",
+        "Fabric API", "JEI", "REI", "WTHIT", "AppleSkin",
+        "Create Fabric", "Botania", "Biomes O' Plenty", "Xaero's Minimap",
+        "JourneyMap", "Waystones", "Iron Chests: Restocked", "Storage Drawers"
+    ),
+    "forge": (
+        "JEI", "OptiFine", "Iron Chests", "Waystones", "Storage Drawers",
+        "Create", "Botania", "Biomes O' Plenty", "Twilight Forest",
+        "Applied Energistics 2", "Thermal Expansion", "JourneyMap",
+        "Xaero's Minimap", "HWYLA", "AppleSkin", "Cooking for Blockheads"
+    ),
+    "quilt": (
+        "Sodium", "Lithium", "Iris Shaders", "FerriteCore", "Quilted Fabric API",
+        "JEI", "REI", "WTHIT", "AppleSkin", "Xaero's Minimap"
+    ),
+    "neoforge": (
+        "JEI", "Iron Chests", "Waystones", "Storage Drawers", "JourneyMap",
+        "Xaero's Minimap", "AppleSkin", "Create", "Botania"
+    ),
+}
+
+
+class RateLimiter:
+    """Thread-safe sliding-window limiter shared by all Modrinth requests"""
+    
+    def __init__(self, max_calls: int, period: float):
+        self.max_calls = max_calls
+        self.period = period
+        self.calls = deque()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until another request may be sent"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.calls and now - self.calls[0] >= self.period:
+                    self.calls.popleft()
+                if len(self.calls) < self.max_calls:
+                    self.calls.append(now)
+                    return
+                wait = self.period - (now - self.calls[0])
+            time.sleep(wait)
+    
+    def pause(self, seconds: float):
+        """Hold every caller off for about seconds (the server's window is used up)"""
+        with self.lock:
+            resume_at = time.monotonic() + seconds - self.period
+            self.calls = deque([resume_at] * self.max_calls)
+
+
+# Modrinth allows ~300 requests/minute; stay at 5 req/s across all threads
+modrinth_rate_limiter = RateLimiter(max_calls=5, period=1.0)
+
+
+@dataclass(slots=True, frozen=True)
 class ModInfo:
-    """Data class to store mod information"""
+    """Data class to store mod information (slotted and immutable once validated)"""
     name: str
     slug: str
     description: str
@@ -40,21 +143,281 @@ class ModInfo:
     updated: str
     versions: List[str]
     loaders: List[str]
+
+
+class ModLookupCache:
+    """On-disk cache of Modrinth lookups keyed by (mod name, MC version, loader)
     
+    Entries hold the ModInfo fields of a match, or None for a definitive miss, and
+    expire after max_age seconds. The file is read lazily and written back after each
+    validation batch (and at exit), dropping expired entries as it goes.
+    """
+    
+    def __init__(self, path: Path, max_age: float = 7 * 24 * 3600):
+        self.path = path
+        self.max_age = max_age
+        self.entries = None
+        self.dirty = False
+        self.lock = threading.Lock()
+    
+    def _load(self):
+        if self.entries is not None:
+            return
+        self.entries = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                pass  # A corrupt cache is just an empty one
+    
+    @staticmethod
+    def key(mod_name: str, mc_version: str, mod_loader: str) -> str:
+        return f"{mod_name}|{mc_version}|{mod_loader}"
+    
+    def get(self, mod_name: str, mc_version: str, mod_loader: str) -> Tuple[bool, Optional[ModInfo]]:
+        """Return (hit, mod_info); mod_info is None on a cached miss"""
+        with self.lock:
+            self._load()
+            entry = self.entries.get(self.key(mod_name, mc_version, mod_loader))
+        if not entry or entry['ts'] < time.time() - self.max_age:
+            return False, None
+        return True, ModInfo(**entry['data']) if entry['data'] else None
+    
+    def put(self, mod_name: str, mc_version: str, mod_loader: str, mod_info: Optional[ModInfo]):
+        with self.lock:
+            self._load()
+            self.entries[self.key(mod_name, mc_version, mod_loader)] = {
+                'ts': time.time(),
+                'data': asdict(mod_info) if mod_info else None
+            }
+            self.dirty = True
+    
+    def save(self):
+        """Atomically write the cache back to disk if anything changed"""
+        with self.lock:
+            if not self.dirty:
+                return
+            cutoff = time.time() - self.max_age
+            self.entries = {key: entry for key, entry in self.entries.items() if entry['ts'] >= cutoff}
+            try:
+                self.path.parent.mkdir(exist_ok=True)
+                tmp_path = self.path.with_suffix('.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.entries, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+                self.dirty = False
+            except OSError:
+                pass  # Losing the cache only costs network requests next run
+
+
+mod_lookup_cache = ModLookupCache(Path("generated/.mod_cache.json"))
+atexit.register(mod_lookup_cache.save)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that passes every request it actually sends through a RateLimiter
+    
+    Responses served by requests-cache never reach the adapter, so they are free.
+    When Modrinth reports the window exhausted, all callers wait for the reset
+    instead of running into 429s.
+    """
+    
+    def __init__(self, limiter: RateLimiter, **kwargs):
+        self.limiter = limiter
+        super().__init__(**kwargs)
+    
+    def send(self, request, **kwargs):
+        self.limiter.acquire()
+        response = super().send(request, **kwargs)
+        if response.headers.get('X-Ratelimit-Remaining') == '0':
+            try:
+                self.limiter.pause(float(response.headers.get('X-Ratelimit-Reset', 1)))
+            except ValueError:
+                self.limiter.pause(1)
+        return response
+
+
+def _build_http_session() -> requests.Session:
+    """Keep-alive session for Modrinth, with retries on transient failures"""
+    if HAVE_REQUESTS_CACHE:
+        # Persist API responses across runs; jars and webhooks bypass the cache
+        cache_dir = Path.home() / '.cache' / 'modsmith'
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        session = requests_cache.CachedSession(
+            cache_name=str(cache_dir / 'http_cache'),
+            backend='sqlite',
+            expire_after=3600,
+            urls_expire_after={'api.modrinth.com': 3600, '*': requests_cache.DO_NOT_CACHE},
+            cache_control=True
+        )
+    else:
+        session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'ModSmith/1.0 (https://github.com/your-username/mod-smith)'
+    })
+    # A 429's Retry-After header is honoured before retrying
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET'])
+    )
+    # Sized for several web sessions validating and downloading at once
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    # Only the API is rate limited; jar downloads come from the CDN
+    session.mount('https://api.modrinth.com/', RateLimitedAdapter(
+        modrinth_rate_limiter, pool_connections=1, pool_maxsize=64, max_retries=retry
+    ))
+    return session
+
+
+http_session = _build_http_session()
+
+
+@lru_cache(maxsize=4096)
+def _candidate_slug(mod_name: str) -> str:
+    """Slug guess for a mod name; memoized because learning and lookups repeat the same names"""
+    return mod_name.lower().strip().replace(' ', '-').replace("'", '')
+
+
+@lru_cache(maxsize=4096)
+def _word_similarity(str1: str, str2: str) -> float:
+    """Word-overlap similarity; memoized because the same title pairs recur across queries"""
+    if str1 == str2:
+        return 1.0
+    
+    # Check if one string contains the other
+    if str1 in str2 or str2 in str1:
+        return 0.8
+    
+    # Simple word overlap calculation
+    words1 = set(str1.split())
+    words2 = set(str2.split())
+    
+    if not words1 or not words2:
+        return 0.0
+    
+    intersection = words1.intersection(words2)
+    union = words1.union(words2)
+    
+    return len(intersection) / len(union)
+
+
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _bigram_jaccard(a, b):
+        """Jaccard index of the byte bigrams of two uint8 arrays"""
+        seen_a = np.zeros(65536, dtype=np.bool_)
+        seen_b = np.zeros(65536, dtype=np.bool_)
+        count_a = 0
+        for i in range(a.shape[0] - 1):
+            h = np.int64(a[i]) * 256 + a[i + 1]
+            if not seen_a[h]:
+                seen_a[h] = True
+                count_a += 1
+        count_b = 0
+        shared = 0
+        for i in range(b.shape[0] - 1):
+            h = np.int64(b[i]) * 256 + b[i + 1]
+            if not seen_b[h]:
+                seen_b[h] = True
+                count_b += 1
+                if seen_a[h]:
+                    shared += 1
+        union = count_a + count_b - shared
+        return shared / union if union else 0.0
+
+
+def _bigram_similarity(str1: str, str2: str) -> float:
+    """Like _word_similarity, but with a JIT-compiled character-bigram overlap"""
+    if str1 == str2:
+        return 1.0
+    if str1 in str2 or str2 in str1:
+        return 0.8
+    # Numba's nopython mode wants fixed-dtype arrays rather than str objects
+    a = np.frombuffer(str1.encode('utf-8'), dtype=np.uint8)
+    b = np.frombuffer(str2.encode('utf-8'), dtype=np.uint8)
+    return float(_bigram_jaccard(a, b))
+
+
+def _iter_json_array_strings(chunks):
+    """Yield each top-level string of the first JSON array in a stream of text chunks
+    
+    Lets callers act on names while the model is still generating. All chunks
+    are consumed even after the array closes so the caller can keep the full text.
+    """
+    depth = 0
+    finished = False
+    in_string = False
+    escaped = False
+    current = []
+    
+    for chunk in chunks:
+        if finished:
+            continue
+        for char in chunk:
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+                    if depth == 1:
+                        try:
+                            yield json.loads('"' + ''.join(current) + '"')
+                        except ValueError:
+                            pass
+                    continue
+                current.append(char)
+            elif char == '"' and depth > 0:
+                in_string = True
+                current = []
+            elif char == '[':
+                depth += 1
+            elif char == ']' and depth > 0:
+                depth -= 1
+                if depth == 0:
+                    finished = True
+                    break
+
+
+def _extract_json_array(text: str) -> Optional[str]:
+    """Return the outermost [...] span of an AI response, or None if there isn't one"""
+    start = text.find('[')
+    end = text.rfind(']')
+    return text[start:end + 1] if start != -1 and end > start else None
+
+
 class MinecraftModGenerator:
     """Main class for generating Minecraft mod recommendations"""
     
     def __init__(self):
         self.gemini_api_key = os.getenv('GEMINI_API_KEY')
         self.modrinth_base_url = "https://api.modrinth.com/v2"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'ModSmith/1.0 (https://github.com/your-username/mod-smith)'
-        })
-        
-        # Track successful and failed mod searches for learning
+        # Process-wide session so keep-alive connections outlive individual generators
+        self.session = http_session
+        
+        # Lookups persisted across runs (shared by every generator in the process)
+        self.mod_cache = mod_lookup_cache
+        # (mod name, MC version, loader) -> Future of a bulk lookup started during generation
+        self.prefetched_lookups = {}
+        # Original suggestions that did not resolve in the last validate_mods call
+        self.unresolved_suggestions: List[str] = []
+        
+        # Track successful and failed mod searches for learning, keyed by normalized
+        # slug so Gemini's arbitrary capitalization still matches past results
         self.successful_mods = set()
         self.failed_mods = set()
+        self.mod_display_names = {}  # slug -> name as last seen, for prompts and reports
+        self.learning_version = 0  # bumped on every learn_* call
+        self.learning_context_cache = (-1, "")
+        self.loader_examples_cache = {}
+        self.learning_digest = None  # content hash of learning_data.json as last read/written
+        self.total_runs = 0
         
         # Enhanced diagnostics tracking
         self.gemini_false_suggestions = set()  # Mods Gemini suggested but don't exist
@@ -91,9 +454,6 @@ class MinecraftModGenerator:
         self.supported_loaders = [
             "fabric", "forge", "quilt", "neoforge"
         ]
-        
-        # Load previous learning data
-        self.load_learning_data()
     
     def print_header(self, text: str):
         """Print styled header"""
@@ -205,18 +565,29 @@ class MinecraftModGenerator:
         """
         
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
-                mod_names = json.loads(json_str)
-                self.print_success(f"Generated {len(mod_names)} mod suggestions!")
-                return mod_names
-            else:
-                mod_names = json.loads(response_text)
-                self.print_success(f"Generated {len(mod_names)} mod suggestions!")
-                return mod_names
+            # Stream the answer and start Modrinth lookups as soon as names are complete
+            response = self.model.generate_content(prompt, stream=True)
+            chunks = []
+            
+            def stream_text():
+                for chunk in response:
+                    chunks.append(chunk.text)
+                    yield chunk.text
+            
+            streamed_names = []
+            for mod_name in _iter_json_array_strings(stream_text()):
+                streamed_names.append(mod_name)
+                if len(streamed_names) == PREFETCH_BATCH_SIZE:
+                    self.prefetch_mods(streamed_names, mc_version, mod_loader)
+                    streamed_names = []
+            if streamed_names:
+                self.prefetch_mods(streamed_names, mc_version, mod_loader)
+            
+            response_text = "".join(chunks).strip()
+            json_str = _extract_json_array(response_text) or response_text
+            mod_names = json.loads(json_str)
+            self.print_success(f"Generated {len(mod_names)} mod suggestions!")
+            return mod_names
         except json.JSONDecodeError as e:
             self.print_error(f"Failed to parse AI response as JSON: {e}")
             self.print_warning("Using fallback mod list...")
@@ -229,70 +600,39 @@ class MinecraftModGenerator:
     def get_loader_specific_examples(self, mod_loader: str, mc_version: str) -> str:
         """Get verified examples of mods for the specific loader and version"""
         
-        examples = {
-            "fabric": [
-                "Sodium", "Lithium", "Iris Shaders", "FerriteCore", "LazyDFU",
-                "Fabric API", "JEI", "REI", "WTHIT", "AppleSkin",
-                "Create Fabric", "Botania", "Biomes O' Plenty", "Xaero's Minimap",
-                "JourneyMap", "Waystones", "Iron Chests: Restocked", "Storage Drawers"
-            ],
-            "forge": [
-                "JEI", "OptiFine", "Iron Chests", "Waystones", "Storage Drawers",
-                "Create", "Botania", "Biomes O' Plenty", "Twilight Forest",
-                "Applied Energistics 2", "Thermal Expansion", "JourneyMap",
-                "Xaero's Minimap", "HWYLA", "AppleSkin", "Cooking for Blockheads"
-            ],
-            "quilt": [
-                "Sodium", "Lithium", "Iris Shaders", "FerriteCore", "Quilted Fabric API",
-                "JEI", "REI", "WTHIT", "AppleSkin", "Xaero's Minimap"
-            ],
-            "neoforge": [
-                "JEI", "Iron Chests", "Waystones", "Storage Drawers", "JourneyMap",
-                "Xaero's Minimap", "AppleSkin", "Create", "Botania"
-            ]
-        }
-        
-        loader_mods = examples.get(mod_loader, examples["fabric"])
-        return "Examples: " + ", ".join(loader_mods[:10]) + f"\n(These are verified to exist on Modrinth for {mod_loader})"
+        if mod_loader not in self.loader_examples_cache:
+            loader_mods = LOADER_EXAMPLES.get(mod_loader, LOADER_EXAMPLES["fabric"])
+            self.loader_examples_cache[mod_loader] = (
+                "Examples: " + ", ".join(loader_mods[:10]) + f"\n(These are verified to exist on Modrinth for {mod_loader})"
+            )
+        return self.loader_examples_cache[mod_loader]
     
     def get_learning_context(self, mod_loader: str) -> str:
         """Generate learning context based on previous successful and failed searches"""
+        # Rebuilt only when learn_success/learn_failure changed the sets since the last prompt
+        if self.learning_context_cache[0] == self.learning_version:
+            return self.learning_context_cache[1]
+        
         context = []
         
         if self.successful_mods:
-            successful_list = list(self.successful_mods)[:15]  # Limit to avoid huge prompts
+            successful_list = [self.mod_display_names.get(key, key) for key in list(self.successful_mods)[:15]]  # Limit to avoid huge prompts
             context.append(f"RECENTLY VERIFIED MODS (use these as reference): {', '.join(successful_list)}")
         
         if self.failed_mods:
-            failed_list = list(self.failed_mods)[:10]
+            failed_list = [self.mod_display_names.get(key, key) for key in list(self.failed_mods)[:10]]
             context.append(f"AVOID THESE MODS (not found on Modrinth): {', '.join(failed_list)}")
         
-        return "\n".join(context) if context else ""
+        self.learning_context_cache = (self.learning_version, "\n".join(context))
+        return self.learning_context_cache[1]
     
     def validate_mods_with_learning(self, mod_suggestions: List[str], mc_version: str, mod_loader: str, theme: str) -> List[ModInfo]:
         """Validate mods and learn from results to improve future suggestions"""
         
         self.print_info("🔍 Validating mods against Modrinth database...")
         
-        valid_mods = []
-        failed_this_round = []
-        
-        for i, mod_name in enumerate(mod_suggestions, 1):
-            print(f"{Fore.CYAN}[{i:2d}/{len(mod_suggestions)}] Checking: {mod_name:<30}", end="")
-            
-            mod_info = self.search_modrinth_mod(mod_name, mc_version, mod_loader)
-            
-            if mod_info:
-                valid_mods.append(mod_info)
-                self.successful_mods.add(mod_info.name)  # Learn from success
-                print(f"{Fore.GREEN}✓ Found: {mod_info.name}")
-            else:
-                self.failed_mods.add(mod_name)  # Learn from failure
-                failed_this_round.append(mod_name)
-                print(f"{Fore.RED}✗ Not found")
-            
-            # Rate limiting - be nice to the API
-            time.sleep(0.2)
+        valid_mods, failed_this_round = self.validate_mod_batch(mod_suggestions, mc_version, mod_loader)
+        self.unresolved_suggestions = failed_this_round
         
         # If we have too many failures, try to get more suggestions
         success_rate = len(valid_mods) / len(mod_suggestions) if mod_suggestions else 0
@@ -303,24 +643,177 @@ class MinecraftModGenerator:
             
             if additional_mods:
                 self.print_info(f"🔄 Validating {len(additional_mods)} improved suggestions...")
-                for i, mod_name in enumerate(additional_mods, 1):
-                    print(f"{Fore.CYAN}[+{i:2d}] Checking: {mod_name:<30}", end="")
-                    
-                    mod_info = self.search_modrinth_mod(mod_name, mc_version, mod_loader)
-                    
-                    if mod_info:
-                        valid_mods.append(mod_info)
-                        self.successful_mods.add(mod_info.name)
-                        print(f"{Fore.GREEN}✓ Found: {mod_info.name}")
-                    else:
-                        self.failed_mods.add(mod_name)
-                        print(f"{Fore.RED}✗ Not found")
-                    
-                    time.sleep(0.2)
+                additional_valid, _ = self.validate_mod_batch(additional_mods, mc_version, mod_loader, label='+')
+                valid_mods.extend(additional_valid)
         
         self.print_success(f"Found {len(valid_mods)} valid mods out of {len(mod_suggestions)} suggestions")
         return valid_mods
     
+    def validate_mod_batch(self, mod_names: List[str], mc_version: str, mod_loader: str, label: str = '') -> Tuple[List[ModInfo], List[str]]:
+        """Look up a batch of mods, keeping results in suggestion order
+        
+        Cached lookups are answered without touching the network. Names whose slug
+        resolves through the bulk /projects endpoint (possibly prefetched while the
+        suggestions were streaming) are settled in a single request; only the
+        remainder fall back to concurrent /search lookups.
+        """
+        
+        results: List[Optional[ModInfo]] = [None] * len(mod_names)
+        total = len(mod_names)
+        done = 0
+        
+        # Results are consumed on this thread only, so the learning sets need no lock
+        def record(index: int, mod_info: Optional[ModInfo]):
+            nonlocal done
+            done += 1
+            mod_name = mod_names[index]
+            results[index] = mod_info
+            
+            counter = f"[{label}{done:2d}]" if label else f"[{done:2d}/{total}]"
+            if mod_info:
+                self.learn_success(mod_info.name)
+                print(f"{Fore.CYAN}{counter} Checking: {mod_name:<30}{Fore.GREEN}✓ Found: {mod_info.name}")
+            elif self.mod_cache.get(mod_name, mc_version, mod_loader)[0]:
+                # Only definitive misses are cached; a lookup that errored teaches nothing
+                self.learn_failure(mod_name)
+                print(f"{Fore.CYAN}{counter} Checking: {mod_name:<30}{Fore.RED}✗ Not found")
+            else:
+                print(f"{Fore.CYAN}{counter} Checking: {mod_name:<30}{Fore.YELLOW}⚠ Lookup failed")
+        
+        uncached = []
+        for index, mod_name in enumerate(mod_names):
+            cached, mod_info = self.mod_cache.get(mod_name, mc_version, mod_loader)
+            if cached:
+                record(index, mod_info)
+            else:
+                uncached.append(index)
+        
+        # Reuse lookups prefetched while the suggestions were streaming in
+        bulk_matches = {}
+        not_prefetched = []
+        for index in uncached:
+            future = self.prefetched_lookups.pop((mod_names[index], mc_version, mod_loader), None)
+            if future is None:
+                not_prefetched.append(mod_names[index])
+            else:
+                bulk_matches.update(future.result())
+        
+        bulk_matches.update(self.bulk_lookup_mods(not_prefetched, mc_version, mod_loader))
+        pending = []
+        for index in uncached:
+            mod_name = mod_names[index]
+            if mod_name in bulk_matches:
+                self.mod_cache.put(mod_name, mc_version, mod_loader, bulk_matches[mod_name])
+                record(index, bulk_matches[mod_name])
+            else:
+                pending.append(index)
+        
+        if pending:
+            with ThreadPoolExecutor(max_workers=VALIDATION_WORKERS) as pool:
+                futures = {
+                    pool.submit(self.search_modrinth_mod, mod_names[index], mc_version, mod_loader, False): index
+                    for index in pending
+                }
+                for future in as_completed(futures):
+                    record(futures[future], future.result())
+        
+        # The web server is usually stopped by a signal, which skips atexit
+        self.mod_cache.save()
+        
+        valid_mods = [mod_info for mod_info in results if mod_info]
+        failed_mods = [mod_name for mod_name, mod_info in zip(mod_names, results) if not mod_info]
+        return valid_mods, failed_mods
+    
+    def prefetch_mods(self, mod_names: List[str], mc_version: str, mod_loader: str):
+        """Start a background bulk lookup for names that validation will need shortly"""
+        names = [
+            mod_name for mod_name in mod_names
+            if not self.mod_cache.get(mod_name, mc_version, mod_loader)[0]
+        ]
+        if not names:
+            return
+        future = prefetch_pool.submit(self.bulk_lookup_mods, names, mc_version, mod_loader)
+        for mod_name in names:
+            self.prefetched_lookups[(mod_name, mc_version, mod_loader)] = future
+    
+    def candidate_slug(self, mod_name: str) -> str:
+        """Guess the Modrinth slug for a mod name (e.g. "Xaero's Minimap" -> "xaeros-minimap")"""
+        return _candidate_slug(mod_name)
+    
+    def learn_success(self, mod_name: str):
+        """Remember a mod that was found on Modrinth"""
+        key = self.candidate_slug(mod_name)
+        self.successful_mods.add(key)
+        self.failed_mods.discard(key)
+        self.mod_display_names[key] = mod_name
+        self.learning_version += 1
+    
+    def learn_failure(self, mod_name: str):
+        """Remember a suggestion that could not be found on Modrinth"""
+        key = self.candidate_slug(mod_name)
+        self.failed_mods.add(key)
+        self.mod_display_names.setdefault(key, mod_name)
+        self.learning_version += 1
+    
+    def mod_info_from_project(self, project: Dict) -> ModInfo:
+        """Build ModInfo from a Modrinth project object (/project or /projects)"""
+        return ModInfo(
+            name=project['title'],
+            slug=project['slug'],
+            description=project.get('description', ''),
+            mod_id=project['id'],
+            categories=project.get('categories', []),
+            downloads=project.get('downloads', 0),
+            updated=project.get('updated', ''),
+            versions=project.get('game_versions', []),
+            loaders=project.get('loaders', [])
+        )
+    
+    def bulk_lookup_mods(self, mod_names: List[str], mc_version: str, mod_loader: str) -> Dict[str, ModInfo]:
+        """Resolve mods by guessed slug through Modrinth's bulk /projects endpoint
+        
+        Returns a mapping of suggested name to ModInfo for every project that exists
+        and supports the requested version and loader. Anything else is left for
+        search_modrinth_mod to find.
+        """
+        
+        names_by_slug: Dict[str, List[str]] = {}
+        for mod_name in mod_names:
+            names_by_slug.setdefault(self.candidate_slug(mod_name), []).append(mod_name)
+        
+        slugs = list(names_by_slug)
+        matches = {}
+        
+        for start in range(0, len(slugs), BULK_LOOKUP_SIZE):
+            chunk = slugs[start:start + BULK_LOOKUP_SIZE]
+            try:
+                response = self.session.get(
+                    f"{self.modrinth_base_url}/projects",
+                    params={'ids': json.dumps(chunk)},
+                    timeout=10
+                )
+                response.raise_for_status()
+                projects = response.json()
+            except (requests.RequestException, ValueError) as e:
+                # Not fatal - every name in this chunk simply goes through /search
+                self.print_warning(f"Bulk Modrinth lookup failed, falling back to search: {e}")
+                continue
+            
+            for project in projects:
+                slug = project.get('slug', '').lower()
+                if slug not in names_by_slug:
+                    continue
+                if (project.get('project_type') != 'mod'
+                        or mc_version not in project.get('game_versions', [])
+                        or mod_loader not in project.get('loaders', [])):
+                    continue
+                
+                mod_info = self.mod_info_from_project(project)
+                for mod_name in names_by_slug[slug]:
+                    matches[mod_name] = mod_info
+        
+        return matches
+    
     def get_improved_suggestions(self, mc_version: str, mod_loader: str, theme: str, failed_mods: List[str]) -> List[str]:
         """Get improved suggestions based on what failed"""
         
@@ -342,9 +835,8 @@ class MinecraftModGenerator:
         try:
             response = self.model.generate_content(improvement_prompt)
             response_text = response.text.strip()
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
+            json_str = _extract_json_array(response_text)
+            if json_str:
                 return json.loads(json_str)
         except:
             pass
@@ -378,9 +870,8 @@ class MinecraftModGenerator:
         try:
             response = self.model.generate_content(fallback_prompt)
             response_text = response.text.strip()
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
+            json_str = _extract_json_array(response_text)
+            if json_str:
                 mod_names = json.loads(json_str)
                 self.print_info(f"Generated {len(mod_names)} fallback suggestions!")
                 return mod_names
@@ -392,9 +883,8 @@ class MinecraftModGenerator:
         try:
             response = self.model.generate_content(basic_prompt)
             response_text = response.text.strip()
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
+            json_str = _extract_json_array(response_text)
+            if json_str:
                 return json.loads(json_str)
         except:
             pass
@@ -403,10 +893,42 @@ class MinecraftModGenerator:
         self.print_error("All AI generation methods failed!")
         return []
     
-    def search_modrinth_mod(self, mod_name: str, mc_version: str, mod_loader: str) -> Optional[ModInfo]:
-        """Search for a mod on Modrinth and return mod info if found, with enhanced error tracking"""
+    def lookup_project_slug(self, mod_name: str, mc_version: str, mod_loader: str) -> Optional[ModInfo]:
+        """Fetch the project at the guessed slug, if it exists and fits the version and loader"""
+        response = self.session.get(
+            f"{self.modrinth_base_url}/project/{requests.utils.quote(self.candidate_slug(mod_name), safe='')}",
+            timeout=10
+        )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        
+        project = response.json()
+        if (project.get('project_type') != 'mod'
+                or mc_version not in project.get('game_versions', [])
+                or mod_loader not in project.get('loaders', [])):
+            return None
+        return self.mod_info_from_project(project)
+    
+    def search_modrinth_mod(self, mod_name: str, mc_version: str, mod_loader: str, try_slug: bool = True) -> Optional[ModInfo]:
+        """Search for a mod on Modrinth and return mod info if found, with enhanced error tracking
+        
+        The guessed slug is tried first with a single /project request; pass
+        try_slug=False when bulk_lookup_mods has already ruled it out.
+        """
+        
+        # Definitive misses are cached per version and loader, and expire like hits
+        cached, mod_info = self.mod_cache.get(mod_name, mc_version, mod_loader)
+        if cached:
+            return mod_info
         
         try:
+            if try_slug:
+                mod_info = self.lookup_project_slug(mod_name, mc_version, mod_loader)
+                if mod_info:
+                    self.mod_cache.put(mod_name, mc_version, mod_loader, mod_info)
+                    return mod_info
+            
             # Try multiple search strategies
             search_queries = [
                 mod_name,  # Exact name
@@ -415,6 +937,11 @@ class MinecraftModGenerator:
                 mod_name.replace("'", ""),  # Remove apostrophes
                 mod_name.split()[0] if " " in mod_name else mod_name  # First word only
             ]
+            # Modrinth search is case-insensitive, so only query each distinct variant once
+            unique_queries = {}
+            for query in search_queries:
+                unique_queries.setdefault(query.lower(), query)
+            search_queries = list(unique_queries.values())
             
             for query in search_queries:
                 search_url = f"{self.modrinth_base_url}/search"
@@ -430,22 +957,10 @@ class MinecraftModGenerator:
                 search_data = response.json()
                 
                 if search_data['hits']:
-                    # Find the best match
-                    best_match = None
-                    best_score = 0
-                    
-                    for hit in search_data['hits']:
-                        # Calculate match score based on name similarity and downloads
-                        name_similarity = self.calculate_similarity(mod_name.lower(), hit['title'].lower())
-                        download_score = min(hit['downloads'] / 1000000, 1.0)  # Normalize downloads
-                        combined_score = name_similarity * 0.8 + download_score * 0.2
-                        
-                        if combined_score > best_score:
-                            best_score = combined_score
-                            best_match = hit
+                    best_match, best_score = self.best_hit(mod_name, search_data['hits'])
                     
                     if best_match and best_score > 0.4:  # Minimum similarity threshold
-                        return ModInfo(
+                        mod_info = ModInfo(
                             name=best_match['title'],
                             slug=best_match['slug'],
                             description=best_match.get('description', ''),
@@ -456,12 +971,12 @@ class MinecraftModGenerator:
                             versions=best_match.get('versions', []),
                             loaders=best_match.get('loaders', [])
                         )
-                
-                # Small delay between search attempts
-                time.sleep(0.1)
+                        self.mod_cache.put(mod_name, mc_version, mod_loader, mod_info)
+                        return mod_info
             
             # If we get here, no queries worked - track as potential Gemini false suggestion
             self.gemini_false_suggestions.add(mod_name)
+            self.mod_cache.put(mod_name, mc_version, mod_loader, None)
             return None
             
         except requests.RequestException as e:
@@ -483,26 +998,39 @@ class MinecraftModGenerator:
             self.print_warning(f"Error searching for {mod_name}: {e}")
             return None
     
+    def best_hit(self, mod_name: str, hits: List[Dict]) -> Tuple[Dict, float]:
+        """Pick the search hit with the best name similarity / downloads blend"""
+        similarities = self.score_titles(mod_name, [hit['title'] for hit in hits])
+        # Scored in one pass; downloads are normalized to [0, 1] at 1M
+        scores = [
+            name_similarity * 0.8 + min(hit['downloads'] / 1000000, 1.0) * 0.2
+            for hit, name_similarity in zip(hits, similarities)
+        ]
+        best = max(range(len(scores)), key=scores.__getitem__)
+        return hits[best], scores[best]
+    
     def calculate_similarity(self, str1: str, str2: str) -> float:
-        """Calculate string similarity using a simple algorithm"""
-        if str1 == str2:
-            return 1.0
-        
-        # Check if one string contains the other
-        if str1 in str2 or str2 in str1:
-            return 0.8
-        
-        # Simple word overlap calculation
-        words1 = set(str1.split())
-        words2 = set(str2.split())
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-        
-        return len(intersection) / len(union)
+        """Calculate string similarity in [0, 1] (rapidfuzz, then Numba, then pure Python)"""
+        if HAVE_RAPIDFUZZ:
+            return fuzz.token_set_ratio(str1, str2, score_cutoff=FUZZY_SCORE_CUTOFF) / 100.0
+        if HAVE_NUMBA:
+            return _bigram_similarity(str1, str2)
+        return _word_similarity(str1, str2)
+    
+    def score_titles(self, mod_name: str, titles: List[str]) -> List[float]:
+        """Similarity of mod_name to each title, in order"""
+        query = mod_name.lower()
+        lowered = [title.lower() for title in titles]
+        
+        if not HAVE_RAPIDFUZZ:
+            return [self.calculate_similarity(query, title) for title in lowered]
+        
+        # Score the whole batch in a single call into rapidfuzz's C++ core
+        scores = [0.0] * len(lowered)
+        for _, score, index in process.extract(query, lowered, scorer=fuzz.token_set_ratio,
+                                               limit=None, score_cutoff=FUZZY_SCORE_CUTOFF):
+            scores[index] = score / 100.0
+        return scores
     
     def validate_mods(self, mod_suggestions: List[str], mc_version: str, mod_loader: str, theme: str) -> List[ModInfo]:
         """Validate mod suggestions against Modrinth database with learning"""
@@ -517,35 +1045,36 @@ class MinecraftModGenerator:
         generated_dir = Path("generated")
         generated_dir.mkdir(exist_ok=True)
         
+        # Every output lists mods by popularity
+        mods_sorted = sorted(valid_mods, key=attrgetter('downloads'), reverse=True)
+        
+        generated_on = time.strftime('%Y-%m-%d %H:%M:%S')
+        
         # Create gen-mods.txt with slug names for Ferium
         gen_mods_path = generated_dir / 'gen-mods.txt'
-        with open(gen_mods_path, 'w', encoding='utf-8') as f:
-            f.write(f"# Generated Modpack: {theme}\n")
-            f.write(f"# Minecraft Version: {mc_version}\n")
-            f.write(f"# Mod Loader: {mod_loader.title()}\n")
-            f.write(f"# Generated on: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"# Total Mods: {len(valid_mods)}\n\n")
-            f.write("# Mod slugs for Ferium (one per line):\n")
-            
-            for mod in sorted(valid_mods, key=lambda x: x.downloads, reverse=True):
-                f.write(f"{mod.slug}\n")
+        gen_mods_path.write_text(
+            f"# Generated Modpack: {theme}\n"
+            f"# Minecraft Version: {mc_version}\n"
+            f"# Mod Loader: {mod_loader.title()}\n"
+            f"# Generated on: {generated_on}\n"
+            f"# Total Mods: {len(valid_mods)}\n\n"
+            "# Mod slugs for Ferium (one per line):\n"
+            + "".join(f"{mod.slug}\n" for mod in mods_sorted),
+            encoding='utf-8'
+        )
         
         # Create detailed mod list
         details_path = generated_dir / 'modpack-details.json'
-        with open(details_path, 'w', encoding='utf-8') as f:
-            modpack_data = {
-                "modpack_info": {
-                    "theme": theme,
-                    "minecraft_version": mc_version,
-                    "mod_loader": mod_loader,
-                    "generated_on": time.strftime('%Y-%m-%d %H:%M:%S'),
-                    "total_mods": len(valid_mods)
-                },
-                "mods": []
-            }
-            
-            for mod in sorted(valid_mods, key=lambda x: x.downloads, reverse=True):
-                modpack_data["mods"].append({
+        modpack_data = {
+            "modpack_info": {
+                "theme": theme,
+                "minecraft_version": mc_version,
+                "mod_loader": mod_loader,
+                "generated_on": generated_on,
+                "total_mods": len(valid_mods)
+            },
+            "mods": [
+                {
                     "name": mod.name,
                     "slug": mod.slug,
                     "description": mod.description,
@@ -553,35 +1082,36 @@ class MinecraftModGenerator:
                     "categories": mod.categories,
                     "downloads": mod.downloads,
                     "last_updated": mod.updated
-                })
-            
-            json.dump(modpack_data, f, indent=2, ensure_ascii=False)
+                } for mod in mods_sorted
+            ]
+        }
+        details_path.write_bytes(orjson.dumps(modpack_data, option=orjson.OPT_INDENT_2))
         
         # Create human-readable summary
         summary_path = generated_dir / 'modpack-summary.md'
-        with open(summary_path, 'w', encoding='utf-8') as f:
-            f.write(f"# {theme} Modpack\n\n")
-            f.write(f"**Minecraft Version:** {mc_version}  \n")
-            f.write(f"**Mod Loader:** {mod_loader.title()}  \n")
-            f.write(f"**Total Mods:** {len(valid_mods)}  \n")
-            f.write(f"**Generated:** {time.strftime('%Y-%m-%d %H:%M:%S')}  \n\n")
-            
-            f.write("## Installation with Ferium\n\n")
-            f.write("1. Install [Ferium](https://github.com/gorilla-devs/ferium)\n")
-            f.write("2. Create a new profile: `ferium profile create`\n")
-            f.write("3. Add mods from gen-mods.txt: `cat generated/gen-mods.txt | grep -v '^#' | xargs -I {} ferium add {}`\n")
-            f.write("4. Download mods: `ferium upgrade`\n\n")
-            
-            f.write("## Mod List\n\n")
-            f.write("| Mod Name | Downloads | Categories | Description |\n")
-            f.write("|----------|-----------|------------|-------------|\n")
-            
-            for mod in sorted(valid_mods, key=lambda x: x.downloads, reverse=True):
-                categories_str = ", ".join(mod.categories[:3])  # Limit categories shown
-                description = mod.description[:100] + "..." if len(mod.description) > 100 else mod.description
-                downloads_formatted = f"{mod.downloads:,}"
-                
-                f.write(f"| {mod.name} | {downloads_formatted} | {categories_str} | {description} |\n")
+        summary_rows = []
+        for mod in mods_sorted:
+            categories_str = ", ".join(mod.categories[:3])  # Limit categories shown
+            description = mod.description[:100] + "..." if len(mod.description) > 100 else mod.description
+            summary_rows.append(f"| {mod.name} | {mod.downloads:,} | {categories_str} | {description} |\n")
+        
+        summary_path.write_text(
+            f"# {theme} Modpack\n\n"
+            f"**Minecraft Version:** {mc_version}  \n"
+            f"**Mod Loader:** {mod_loader.title()}  \n"
+            f"**Total Mods:** {len(valid_mods)}  \n"
+            f"**Generated:** {generated_on}  \n\n"
+            "## Installation with Ferium\n\n"
+            "1. Install [Ferium](https://github.com/gorilla-devs/ferium)\n"
+            "2. Create a new profile: `ferium profile create`\n"
+            "3. Add mods from gen-mods.txt: `cat generated/gen-mods.txt | grep -v '^#' | xargs -I {} ferium add {}`\n"
+            "4. Download mods: `ferium upgrade`\n\n"
+            "## Mod List\n\n"
+            "| Mod Name | Downloads | Categories | Description |\n"
+            "|----------|-----------|------------|-------------|\n"
+            + "".join(summary_rows),
+            encoding='utf-8'
+        )
         
         self.print_success("Generated files:")
         self.print_info(f"  • {gen_mods_path} - Mod slugs for Ferium")
@@ -764,13 +1294,22 @@ class MinecraftModGenerator:
         learning_file = Path("generated/learning_data.json")
         if learning_file.exists():
             try:
-                with open(learning_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.failed_mods = set(data.get('failed_mods', []))
-                    self.successful_mods = set(data.get('successful_mods', []))
+                with open(learning_file, 'rb') as f:
+                    data = orjson.loads(f.read())
+                    for mod_name in data.get('failed_mods', []):
+                        self.learn_failure(mod_name)
+                    for mod_name in data.get('successful_mods', []):
+                        self.learn_success(mod_name)
+                    self.learning_digest = self.learning_content_digest(data)
                     print(f"{Fore.BLUE}📚 Loaded learning data: {len(self.failed_mods)} known failures, {len(self.successful_mods)} known successes{Style.RESET_ALL}")
             except Exception as e:
                 self.print_warning(f"Could not load learning data: {e}")
+        
+        # Kept apart from learning_data.json so counting a run never forces that rewrite
+        try:
+            self.total_runs = int(Path("generated/.learning_runs").read_text())
+        except (OSError, ValueError):
+            pass
     
     def save_learning_data(self):
         """Save learning data to disk for future runs"""
@@ -780,19 +1319,43 @@ class MinecraftModGenerator:
         
         learning_file = generated_dir / "learning_data.json"
         try:
+            # Every run counts, whether or not it changed the learned lists
+            self.total_runs += 1
+            runs_file = generated_dir / ".learning_runs"
+            runs_tmp = runs_file.with_suffix('.tmp')
+            runs_tmp.write_text(str(self.total_runs))
+            os.replace(runs_tmp, runs_file)
+            
             data = {
-                'failed_mods': list(self.failed_mods),
-                'successful_mods': list(self.successful_mods),
+                'failed_mods': sorted(self.mod_display_names.get(key, key) for key in self.failed_mods),
+                'successful_mods': sorted(self.mod_display_names.get(key, key) for key in self.successful_mods),
                 'last_updated': datetime.now().isoformat(),
-                'gemini_false_suggestions': list(self.gemini_false_suggestions),
-                'total_runs': getattr(self, 'total_runs', 0) + 1
+                'gemini_false_suggestions': sorted(self.gemini_false_suggestions)
             }
-            with open(learning_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            
+            # Nothing learned since the file was read - leave it alone
+            digest = self.learning_content_digest(data)
+            if digest == self.learning_digest:
+                return
+            
+            # Write-then-rename so a crash never leaves a truncated file behind
+            tmp_path = learning_file.with_suffix('.json.tmp')
+            tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_path, learning_file)
+            self.learning_digest = digest
             print(f"{Fore.BLUE}💾 Saved learning data for future runs{Style.RESET_ALL}")
         except Exception as e:
             self.print_warning(f"Could not save learning data: {e}")
     
+    @staticmethod
+    def learning_content_digest(data: Dict) -> bytes:
+        """Hash of the learned lists, ignoring bookkeeping fields like timestamps"""
+        content = {
+            field: sorted(data.get(field, []))
+            for field in ('failed_mods', 'successful_mods', 'gemini_false_suggestions')
+        }
+        return hashlib.blake2b(orjson.dumps(content), digest_size=16).digest()
+    
     def check_ferium_installed(self) -> bool:
         """Check if Ferium is installed and available"""
         try:
@@ -867,9 +1430,6 @@ class MinecraftModGenerator:
                 else:
                     print(f"{Fore.RED}✗ Failed")
                     failed_mods.append(slug)
-                
-                # Small delay to be nice to APIs
-                time.sleep(0.5)
             
             if failed_mods:
                 self.print_warning(f"Failed to add {len(failed_mods)} mods: {', '.join(failed_mods[:5])}")
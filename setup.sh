@@ -14,7 +14,7 @@ if command -v apt &> /dev/null; then
     echo "✅ System dependencies installed!"
 else
     echo "ℹ️  This script is designed for Ubuntu/Debian systems."
-    echo "Please install Python 3.8+, python3-venv, and python3-pip manually."
+    echo "Please install Python 3.10+, python3-venv, and python3-pip manually."
 fi
 
 echo ""
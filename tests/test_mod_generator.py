@@ -0,0 +1,65 @@
+"""Modrinth matching in MinecraftModGenerator, with the network stubbed out"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('GEMINI_API_KEY', 'test-key')
+
+import mod_generator
+from mod_generator import MinecraftModGenerator, ModLookupCache
+
+
+def search_hit(title, slug, downloads):
+    return {
+        'title': title, 'slug': slug, 'project_id': slug, 'description': '',
+        'categories': [], 'downloads': downloads, 'date_modified': '',
+        'versions': ['1.20.1'], 'loaders': ['fabric']
+    }
+
+
+class SearchMatchingTest(unittest.TestCase):
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        previous_cwd = os.getcwd()
+        os.chdir(workdir.name)
+        self.addCleanup(os.chdir, previous_cwd)
+
+        patches = [
+            mock.patch.object(mod_generator, 'mod_lookup_cache', ModLookupCache(Path(workdir.name) / 'cache.json')),
+            mock.patch.object(mod_generator.genai, 'configure'),
+            mock.patch.object(mod_generator.genai, 'GenerativeModel'),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.generator = MinecraftModGenerator()
+
+    def search(self, mod_name, hits):
+        response = mock.Mock()
+        response.json.return_value = {'hits': hits}
+        with mock.patch.object(self.generator.session, 'get', return_value=response):
+            return self.generator.search_modrinth_mod(mod_name, '1.20.1', 'fabric', try_slug=False)
+
+    def test_hallucinated_names_do_not_match_popular_mods(self):
+        cases = [
+            ('Sky Kingdoms', search_hit('Skyblock Builder', 'skyblock-builder', 5_000_000)),
+            ('Enchanted Forest', search_hit('Enchantment Descriptions', 'enchantment-descriptions', 5_000_000)),
+            ('Frost Biomes', search_hit("Biomes O' Plenty", 'biomes-o-plenty', 0)),
+        ]
+        for mod_name, hit in cases:
+            with self.subTest(mod_name=mod_name):
+                self.assertIsNone(self.search(mod_name, [hit]))
+
+    def test_close_spellings_still_match(self):
+        mod_info = self.search("Farmers Delight", [search_hit("Farmer's Delight", 'farmers-delight', 100)])
+        self.assertEqual(mod_info.slug, 'farmers-delight')
+
+
+if __name__ == '__main__':
+    unittest.main()
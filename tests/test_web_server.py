@@ -0,0 +1,171 @@
+"""End-to-end check of a web generation with Gemini and Modrinth stubbed out"""
+
+import gzip
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('GEMINI_API_KEY', 'test-key')
+
+import orjson
+
+import mod_generator
+import web_server
+from mod_generator import ModInfo, ModLookupCache
+
+
+def make_mod(name, slug):
+    return ModInfo(
+        name=name, slug=slug, description=f"{name} description", mod_id=slug,
+        categories=['utility'], downloads=1000, updated='2024-01-01T00:00:00Z',
+        versions=['1.20.1'], loaders=['fabric']
+    )
+
+
+KNOWN_MODS = {
+    'Sodium': make_mod('Sodium', 'sodium'),
+    'Lithium': make_mod('Lithium', 'lithium'),
+}
+
+
+class WebGenerateModpackTest(unittest.TestCase):
+    def setUp(self):
+        # Generation writes to ./generated, so run inside a scratch directory
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        previous_cwd = os.getcwd()
+        os.chdir(self.workdir.name)
+        self.addCleanup(os.chdir, previous_cwd)
+
+        self.cache = ModLookupCache(Path(self.workdir.name) / 'mod_cache.json')
+        patches = [
+            mock.patch.object(mod_generator, 'mod_lookup_cache', self.cache),
+            mock.patch.object(mod_generator.genai, 'configure'),
+            mock.patch.object(mod_generator.genai, 'GenerativeModel'),
+            mock.patch.object(
+                web_server.WebModGenerator, 'generate_mod_suggestions',
+                return_value=['Sodium', 'Lithium', 'Imaginary Mod']
+            ),
+            mock.patch.object(
+                web_server.WebModGenerator, 'bulk_lookup_mods',
+                side_effect=lambda names, *args: {
+                    name: KNOWN_MODS[name] for name in names if name in KNOWN_MODS
+                }
+            ),
+            mock.patch.object(web_server.WebModGenerator, 'search_modrinth_mod', return_value=None),
+            mock.patch.object(web_server.WebModGenerator, 'get_improved_suggestions', return_value=[]),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def generate(self):
+        generator = web_server.WebModGenerator('test-session')
+        self.addCleanup(web_server.active_sessions.discard, 'test-session')
+        generator.web_generate_modpack('1.20.1', 'fabric', 'Performance')
+        return generator
+
+    def test_generation_completes_with_result(self):
+        generator = self.generate()
+
+        self.assertEqual(generator.progress['status'], 'completed', generator.progress['error'])
+        result = orjson.loads(generator.result_json)
+        self.assertEqual([mod['slug'] for mod in result['mods']], ['sodium', 'lithium'])
+        self.assertEqual(result['failedMods'], ['Imaginary Mod'])
+        self.assertEqual(result['successRate'], 67)
+        self.assertIn('details', generator.artifacts)
+        self.assertTrue((Path('generated') / 'gen-mods.txt').exists())
+        # Lookups reach disk without waiting for interpreter exit
+        self.assertIn('Sodium|1.20.1|fabric', orjson.loads(self.cache.path.read_bytes()))
+
+    def test_progress_revalidates_when_gzipped(self):
+        generator = self.generate()
+        # Enough detail lines to push the payload over the compression threshold
+        for line in range(20):
+            generator.add_progress_detail(f"Downloaded mod number {line}")
+        client = web_server.app.test_client()
+        headers = {'Accept-Encoding': 'gzip'}
+
+        response = client.get('/api/progress/test-session', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.data), generator.progress_payload[0])
+        # Compressed once per change, not once per poll
+        self.assertIs(generator.gzipped_progress(), generator.gzipped_progress())
+
+        revalidated = client.get('/api/progress/test-session', headers={
+            **headers, 'If-None-Match': response.headers['ETag']
+        })
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_artifact_downloads_stay_byte_exact(self):
+        generator = self.generate()
+        client = web_server.app.test_client()
+        headers = {'Accept-Encoding': 'gzip'}
+
+        for file_type in ('details', 'summary'):
+            _, data, _ = generator.artifacts[file_type]
+            response = client.get(f'/api/download/test-session/{file_type}', headers=headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('Content-Encoding', response.headers)
+            self.assertEqual(response.data, data)
+
+            revalidated = client.get(f'/api/download/test-session/{file_type}', headers={
+                **headers, 'If-None-Match': response.headers['ETag']
+            })
+            self.assertEqual(revalidated.status_code, 304)
+
+            partial = client.get(f'/api/download/test-session/{file_type}', headers={
+                **headers, 'Range': 'bytes=0-99'
+            })
+            self.assertEqual(partial.status_code, 206)
+            self.assertNotIn('Content-Encoding', partial.headers)
+            self.assertEqual(partial.data, data[:100])
+
+    def test_mod_files_name_is_sanitized(self):
+        generator = self.generate()
+        generator.result['mcVersion'] = '1.20.1\r\nSet-Cookie: a=b; filename="../x'
+        archive = Path(self.workdir.name) / 'cached.zip'
+        archive.write_bytes(b'PK')
+        client = web_server.app.test_client()
+
+        with mock.patch.object(web_server.zip_cache, 'lookup', return_value=archive):
+            response = client.get('/api/download/test-session/mod-files')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Set-Cookie', response.headers)
+        disposition = response.headers['Content-Disposition']
+        self.assertTrue(disposition.startswith('attachment; filename=modpack-'), disposition)
+        self.assertNotIn('"', disposition.split('filename=', 1)[1])
+        self.assertNotIn('/', disposition)
+
+
+class PushNotificationValidationTest(unittest.TestCase):
+    def post_generate(self, push_notification):
+        client = web_server.app.test_client()
+        with mock.patch.object(web_server.generation_pool, 'submit') as submit:
+            response = client.post('/api/generate', json={
+                'mcVersion': '1.20.1', 'modLoader': 'fabric', 'theme': 'Performance',
+                'pushNotification': push_notification
+            })
+        submit.assert_not_called()
+        return response
+
+    def test_internal_addresses_are_rejected(self):
+        for url in ('http://127.0.0.1:8080/hook', 'http://10.0.0.5/hook',
+                    'http://169.254.169.254/latest', 'http://[::1]/hook', 'http://localhost/hook'):
+            with self.subTest(url=url):
+                self.assertEqual(self.post_generate({'url': url, 'token': 'secret'}).status_code, 400)
+
+    def test_token_must_be_a_string(self):
+        with mock.patch.object(web_server, 'is_public_host', return_value=True):
+            response = self.post_generate({'url': 'https://hooks.example.com/', 'token': 123})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('token', response.get_json()['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,64 +4,719 @@ ModSmith Web Backend - Flask API for the web interface
 Connects the beautiful frontend with the AI-powered modpack generation
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from flask_cors import CORS
+import gzip
+import atexit
+import hashlib
+import hmac
+import ipaddress
 import os
 import sys
-import json
 import threading
+import queue
+import re
 import time
+import weakref
 from pathlib import Path
 import zipfile
 import io
+import itertools
+import orjson
 import requests
 import tempfile
 import shutil
+import socket
+import subprocess
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse
+from werkzeug.utils import secure_filename
 
 # Import our existing ModSmith logic
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from mod_generator import MinecraftModGenerator
 
+class OrJSONProvider(DefaultJSONProvider):
+    """Serve jsonify() responses through orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__, static_folder='web', static_url_path='')
+app.json = OrJSONProvider(app)
+# gzip only the JSON endpoints marked @compress.compressed(). Applied app-wide it
+# would also encode file downloads, breaking Range requests and ETag revalidation.
+app.config.update(
+    COMPRESS_REGISTER=False,
+    COMPRESS_MIMETYPES=['application/json'],
+    COMPRESS_ALGORITHM='gzip',
+    COMPRESS_LEVEL=4,
+    COMPRESS_MIN_SIZE=500,
+)
+compress = Compress(app)
 CORS(app)
 
+# The single-page frontend is served from memory for / and every unknown route,
+# compressed once up front for clients that accept gzip
+INDEX_HTML_BYTES = (Path(__file__).resolve().parent / 'web' / 'index.html').read_bytes()
+INDEX_HTML_GZIP = gzip.compress(INDEX_HTML_BYTES, 9)
+INDEX_HTML_ETAG = hashlib.blake2b(INDEX_HTML_BYTES, digest_size=8).hexdigest()
+
+def run_ferium(cmd, timeout):
+    """Run a Ferium command and capture its output
+    
+    close_fds=False lets CPython use posix_spawn/vfork instead of fork(), which
+    matters when the server process is large and Ferium is called many times.
+    """
+    return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, close_fds=False)
+
+
+_ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;]*m')
+
+
+def stream_ferium(cmd, timeout, on_line):
+    """Run a long Ferium command, handing each output line to on_line as it appears
+    
+    Output is never held in full. A watchdog kills Ferium after timeout seconds,
+    which raises subprocess.TimeoutExpired like run_ferium; returns the exit code.
+    """
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, bufsize=1, close_fds=False)
+    timed_out = threading.Event()
+    
+    def kill():
+        timed_out.set()
+        proc.kill()
+    
+    watchdog = threading.Timer(timeout, kill)
+    watchdog.start()
+    try:
+        with proc.stdout:
+            for line in proc.stdout:
+                on_line(_ANSI_ESCAPE.sub('', line).rstrip())
+        returncode = proc.wait()
+    finally:
+        watchdog.cancel()
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return returncode
+
+
+def parse_ferium_profiles(output):
+    """Profile names from `ferium profile list` (unindented lines, active one marked '*')"""
+    return [
+        line.rstrip(' *')
+        for line in _ANSI_ESCAPE.sub('', output).splitlines()
+        if line.strip() and not line[0].isspace()
+    ]
+
+
+def ferium_already_added(result):
+    """Whether a failed `ferium add` only failed because the mod is already in the profile"""
+    return 'already' in f"{result.stdout}\n{result.stderr}".lower()
+
+
+# Every profile the web server creates is named with this prefix
+FERIUM_PROFILE_PREFIX = 'modsmith-web-'
+
+
+def delete_ferium_profile(profile_name):
+    """Remove a profile the server created; failures are only logged"""
+    try:
+        print(f"🧹 Cleaning up Ferium profile: {profile_name}")
+        # Switch away first, preferring the user's own profiles over other sessions'
+        list_result = run_ferium(['ferium', 'profile', 'list'], timeout=10)
+        others = [name for name in parse_ferium_profiles(list_result.stdout) if name != profile_name]
+        others.sort(key=lambda name: name.startswith(FERIUM_PROFILE_PREFIX))
+        if others:
+            run_ferium(['ferium', 'profile', 'switch', others[0]], timeout=10)
+        
+        delete_cmd = ['ferium', 'profile', 'delete', profile_name, '--force']
+        delete_result = run_ferium(delete_cmd, timeout=10)
+        if delete_result.returncode == 0:
+            print(f"✅ Cleaned up Ferium profile: {profile_name}")
+        else:
+            print(f"⚠️  Could not delete profile: {delete_result.stderr}")
+            
+    except Exception as cleanup_error:
+        print(f"⚠️  Could not clean up Ferium profile: {cleanup_error}")
+
+
+def delete_stale_ferium_profiles():
+    """Delete server profiles left behind by a crash or a killed download"""
+    if not shutil.which('ferium'):
+        return
+    try:
+        list_result = run_ferium(['ferium', 'profile', 'list'], timeout=10)
+    except Exception as e:
+        print(f"⚠️  Could not list Ferium profiles: {e}")
+        return
+    for name in parse_ferium_profiles(list_result.stdout):
+        if name.startswith(FERIUM_PROFILE_PREFIX):
+            delete_ferium_profile(name)
+
+
+class SessionStore:
+    """Thread-safe session registry that forgets sessions idle for longer than ttl seconds
+    
+    Sessions that are still generating are never expired.
+    """
+    
+    def __init__(self, ttl=3600, max_sessions=1024):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.sessions = OrderedDict()  # session_id -> (generator, last_access), oldest first
+        self.lock = threading.Lock()
+    
+    def _expire(self, now):
+        """Unlink expired sessions and return their generators for closing"""
+        expired = []
+        for session_id, (generator, last_access) in list(self.sessions.items()):
+            if now - last_access < self.ttl and len(self.sessions) <= self.max_sessions:
+                break
+            if generator.progress['status'] in ('starting', 'processing'):
+                continue
+            del self.sessions[session_id]
+            expired.append(generator)
+        return expired
+    
+    @staticmethod
+    def _close_all(generators):
+        # Outside the lock: closing removes directories from disk
+        for generator in generators:
+            generator.close()
+    
+    def add(self, session_id, generator):
+        with self.lock:
+            now = time.monotonic()
+            self.sessions[session_id] = (generator, now)
+            expired = self._expire(now)
+        self._close_all(expired)
+    
+    def get(self, session_id):
+        """Return the session's generator (refreshing its TTL), or None"""
+        with self.lock:
+            now = time.monotonic()
+            expired = self._expire(now)
+            entry = self.sessions.pop(session_id, None)
+            if entry is not None:
+                self.sessions[session_id] = (entry[0], now)
+        self._close_all(expired)
+        return entry[0] if entry else None
+    
+    def sweep(self):
+        """Expire idle sessions even when no requests arrive to trigger it"""
+        with self.lock:
+            expired = self._expire(time.monotonic())
+        self._close_all(expired)
+    
+    def discard(self, session_id):
+        with self.lock:
+            entry = self.sessions.pop(session_id, None)
+        if entry:
+            entry[0].close()
+
+
 # Global storage for active generation sessions
-active_sessions = {}
+active_sessions = SessionStore()
+
+# Background jobs run on bounded pools instead of a new thread per request.
+# Ferium keeps one global "active profile", so its jobs must run one at a time.
+GENERATION_WORKERS = 4
+generation_pool = ThreadPoolExecutor(max_workers=GENERATION_WORKERS, thread_name_prefix='generate')
+ferium_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ferium')
+# Webhook deliveries, so a slow client endpoint never stalls a generation
+webhook_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='webhook')
+# Deliveries get exactly one attempt, so keep them off the retrying Modrinth session
+webhook_session = requests.Session()
+webhook_session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=4, max_retries=0))
+webhook_session.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=4, max_retries=0))
+# The server listens on all interfaces with CORS open, so by default it won't POST to
+# loopback, private or link-local addresses on a client's say-so
+ALLOW_PRIVATE_WEBHOOKS = os.environ.get('MODSMITH_ALLOW_PRIVATE_WEBHOOKS') == '1'
+
+
+def is_public_host(hostname):
+    """Whether every address hostname resolves to is publicly routable"""
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(hostname, None)}
+    except (socket.gaierror, UnicodeError):
+        return False
+    return bool(addresses) and all(
+        ipaddress.ip_address(address.split('%')[0]).is_global for address in addresses
+    )
+
+# Parallel jar downloads per request, over the shared keep-alive session (64 connections)
+DOWNLOAD_WORKERS = 16
+
+
+class VersionsCache:
+    """Bounded LRU of Modrinth version listings keyed by (slug, mc_version, loader)
+    
+    Entries expire after ttl seconds so newly published mod versions show up.
+    """
+    
+    def __init__(self, max_entries=4096, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (versions, stored_at)
+        self.lock = threading.Lock()
+    
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            versions, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return versions
+    
+    def put(self, key, versions):
+        with self.lock:
+            self.entries[key] = (versions, time.monotonic())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+# Shared by every session so repeat downloads skip the versions request
+versions_cache = VersionsCache()
+
+# Downloadable outputs in generated/, by download type
+GENERATED_FILES = {
+    'mods': 'gen-mods.txt',
+    'details': 'modpack-details.json',
+    'summary': 'modpack-summary.md',
+}
+
+# Only the most recent progress detail lines are kept and sent to clients
+MAX_PROGRESS_DETAILS = 50
+
+class FeriumRejectCache:
+    """Slugs `ferium add` rejected, per MC version and loader, persisted across runs
+    
+    Known rejects are left out of the batch add, so one bad slug doesn't force a
+    subprocess per mod every time. Entries expire after max_age seconds in case
+    the mod gets ported.
+    """
+    
+    def __init__(self, path, max_age=24 * 3600):
+        self.path = Path(path)
+        self.max_age = max_age
+        self.entries = None  # "slug|mc_version|loader" -> rejected_at
+        self.lock = threading.Lock()
+    
+    def _load(self):
+        if self.entries is not None:
+            return
+        try:
+            self.entries = orjson.loads(self.path.read_bytes())
+        except (OSError, ValueError):
+            self.entries = {}  # A missing or corrupt cache is just an empty one
+    
+    def rejected(self, slugs, mc_version, mod_loader):
+        """The subset of slugs Ferium rejected recently"""
+        cutoff = time.time() - self.max_age
+        with self.lock:
+            self._load()
+            return {
+                slug for slug in slugs
+                if self.entries.get(f"{slug}|{mc_version}|{mod_loader}", 0) > cutoff
+            }
+    
+    def record(self, slug, mc_version, mod_loader, added):
+        with self.lock:
+            self._load()
+            key = f"{slug}|{mc_version}|{mod_loader}"
+            if added:
+                self.entries.pop(key, None)
+            else:
+                self.entries[key] = time.time()
+    
+    def save(self):
+        with self.lock:
+            if self.entries is None:
+                return
+            try:
+                tmp_path = self.path.with_suffix('.tmp')
+                tmp_path.write_bytes(orjson.dumps(self.entries))
+                os.replace(tmp_path, self.path)
+            except OSError:
+                pass  # Losing the cache only costs subprocess calls next run
+
+
+# Hidden, so it stays out of the 'all' download
+ferium_reject_cache = FeriumRejectCache(Path("generated/.ferium_rejects.json"))
+
+class JarCache:
+    """Content-addressed store of downloaded mod jars, keyed by Modrinth's SHA-1
+    
+    Entries are hardlinked into per-request directories, so a cache hit costs no
+    network and no copy. The least recently used jars are evicted above max_bytes.
+    """
+    
+    def __init__(self, root, max_bytes):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.evict_lock = threading.Lock()
+    
+    def path_for(self, sha1):
+        return self.root / sha1[:2] / sha1
+    
+    def link_into(self, sha1, dest):
+        """Place a cached jar at dest; False if it isn't cached"""
+        cached = self.path_for(sha1)
+        try:
+            os.utime(cached)  # mark as recently used
+            try:
+                os.link(cached, dest)
+            except OSError:
+                shutil.copyfile(cached, dest)  # cache on another filesystem
+            return True
+        except FileNotFoundError:
+            return False
+    
+    def store(self, response, sha1, dest):
+        """Stream a download into the cache, verifying its SHA-1, then place it at dest"""
+        cached = self.path_for(sha1)
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cached.with_name(f"{sha1}.{threading.get_ident()}.tmp")
+        digest = hashlib.sha1()
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=ZIP_CHUNK_SIZE):
+                    digest.update(chunk)
+                    f.write(chunk)
+            if digest.hexdigest() != sha1:
+                raise ValueError(f"SHA-1 mismatch for {dest.name}")
+            os.replace(tmp_path, cached)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return self.link_into(sha1, dest)
+    
+    def evict(self):
+        """Delete least recently used jars until the cache fits in max_bytes"""
+        with self.evict_lock:
+            entries = []
+            total = 0
+            for path in self.root.glob('??/*'):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+            if total <= self.max_bytes:
+                return
+            for _, size, path in sorted(entries):
+                path.unlink(missing_ok=True)
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+
+# Jars survive across requests and restarts; repeat downloads become hardlinks
+jar_cache = JarCache(Path.home() / '.cache' / 'modsmith' / 'jars', max_bytes=2 * 1024 ** 3)
+
+class ZipCache:
+    """On-disk cache of built mod-files archives, keyed by what went into them
+    
+    Archives expire after ttl seconds, matching how long version listings are
+    trusted, so a cached modpack never lags far behind new mod releases.
+    """
+    
+    def __init__(self, root, ttl=3600):
+        self.root = Path(root)
+        self.ttl = ttl
+    
+    @staticmethod
+    def key_for(*parts):
+        return hashlib.sha256(orjson.dumps(parts)).hexdigest()
+    
+    def lookup(self, key):
+        """Path of a fresh cached archive, or None"""
+        path = self.root / f"{key}.zip"
+        try:
+            if time.time() - path.stat().st_mtime < self.ttl:
+                return path
+        except FileNotFoundError:
+            pass
+        return None
+    
+    def tee(self, key, chunks):
+        """Pass chunks through while saving them; only complete archives are kept"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.root / f"{key}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    yield chunk
+            os.replace(tmp_path, self.root / f"{key}.zip")
+            self.sweep()
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    
+    def sweep(self):
+        """Delete expired archives"""
+        cutoff = time.time() - self.ttl
+        for path in self.root.glob('*.zip'):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+# Per-request working directories (downloaded jars awaiting zipping). Kept out of
+# $TMPDIR, which is often a RAM-backed tmpfs, and swept by a janitor thread so a
+# crashed or abandoned request can't leak a whole modpack.
+SCRATCH_DIR = Path(os.environ.get('MODSMITH_SCRATCH', Path.home() / '.cache' / 'modsmith' / 'scratch'))
+SCRATCH_MAX_AGE = 3600
+SCRATCH_SWEEP_INTERVAL = 300
+_scratch_dirs = set()  # created by this process, removed at exit
+
+
+def make_scratch_dir(prefix):
+    SCRATCH_DIR.mkdir(parents=True, exist_ok=True)
+    path = Path(tempfile.mkdtemp(prefix=prefix, dir=SCRATCH_DIR))
+    _scratch_dirs.add(path)
+    return path
+
+
+def sweep_scratch():
+    """Remove scratch directories older than SCRATCH_MAX_AGE"""
+    cutoff = time.time() - SCRATCH_MAX_AGE
+    try:
+        with os.scandir(SCRATCH_DIR) as entries:
+            stale = [entry.path for entry in entries if entry.stat().st_mtime < cutoff]
+    except FileNotFoundError:
+        return
+    for path in stale:
+        shutil.rmtree(path, ignore_errors=True)
+    for path in list(_scratch_dirs):
+        if not path.exists():
+            _scratch_dirs.discard(path)
+
+
+def _remove_scratch_dirs():
+    for path in list(_scratch_dirs):
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _janitor():
+    while True:
+        time.sleep(SCRATCH_SWEEP_INTERVAL)
+        active_sessions.sweep()
+        sweep_scratch()
+
+
+threading.Thread(target=_janitor, name='janitor', daemon=True).start()
+atexit.register(_remove_scratch_dirs)
+
+# Finished mod-files archives, reused by later downloads of the same modpack
+zip_cache = ZipCache(Path.home() / '.cache' / 'modsmith' / 'zips')
+
+# Idle progress streams get a keepalive comment this often
+SSE_HEARTBEAT_SECONDS = 15
+
+# Files are streamed into response chunks of about this size
+ZIP_CHUNK_SIZE = 64 * 1024
+
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable write target for ZipFile; bytes are drained as response chunks"""
+    
+    def __init__(self):
+        super().__init__()
+        self.pending = bytearray()
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self.pending += data
+        return len(data)
+    
+    def drain(self):
+        data = bytes(self.pending)
+        self.pending.clear()
+        return data
+
+
+def iter_zip(entries):
+    """Yield a zip archive chunk by chunk without building it in memory
+    
+    entries are (arcname, source, compress_type) tuples where source is either
+    a path on disk or the file contents as bytes.
+    """
+    sink = _ZipSink()
+    # compresslevel only applies to ZIP_DEFLATED entries (small text files)
+    with zipfile.ZipFile(sink, 'w', compresslevel=1) as zip_file:
+        for arcname, source, compress_type in entries:
+            if isinstance(source, bytes):
+                zip_file.writestr(arcname, source, compress_type=compress_type)
+            else:
+                zip_info = zipfile.ZipInfo.from_file(source, arcname)
+                zip_info.compress_type = compress_type
+                with open(source, 'rb') as src, zip_file.open(zip_info, 'w') as dst:
+                    while chunk := src.read(ZIP_CHUNK_SIZE):
+                        dst.write(chunk)
+                        if len(sink.pending) >= ZIP_CHUNK_SIZE:
+                            yield sink.drain()
+            if sink.pending:
+                yield sink.drain()
+    yield sink.drain()
 
 class WebModGenerator(MinecraftModGenerator):
     """Extended ModGenerator for web interface with progress tracking"""
     
-    def __init__(self, session_id):
+    def __init__(self, session_id, push_notification=None):
         super().__init__()
         self.session_id = session_id
+        # Optional {'url', 'token'} webhook that receives every progress change
+        self.push_notification = push_notification
+        self.push_sequence = itertools.count(1)
         self.progress = {
             'step': 0,
             'total_steps': 5,
             'current_step': 'Initializing...',
             'percentage': 0,
             'status': 'starting',
-            'details': [],
+            'details': deque(maxlen=MAX_PROGRESS_DETAILS),
             'error': None
         }
-        active_sessions[session_id] = self 
+        # Writers hold the lock and re-serialize once per change; readers only ever
+        # see the finished bytes, never a half-applied update
+        self.progress_lock = threading.Lock()
+        self.progress_gzip = None
+        self._serialize_progress()
+        self.valid_mods = []
+        self.result = None
+        self.result_json = None
+        # This generation's downloads, captured once it finishes because the next
+        # session overwrites generated/: file type -> (download name, bytes, etag)
+        self.artifacts = {}
+        self.artifacts_built = None
+        self.temp_dir_cleanups = set()  # finalizers of mod-files temp dirs still on disk
+        self.subscribers = set()  # one queue of serialized snapshots per open SSE stream
+        self.subscribers_lock = threading.Lock()
+        active_sessions.add(session_id, self)
+    
+    def _serialize_progress(self):
+        """Re-serialize progress after a change; callers hold progress_lock"""
+        snapshot = dict(self.progress)
+        snapshot['details'] = list(snapshot['details'])
+        progress_json = orjson.dumps(snapshot)
+        # One attribute, swapped atomically, so the body and its ETag always agree
+        self.progress_payload = (progress_json, hashlib.blake2b(progress_json, digest_size=8).hexdigest())
+    
+    def gzipped_progress(self):
+        """(etag, body) of the current progress, gzipped at most once per change"""
+        progress_json, etag = self.progress_payload
+        cached = self.progress_gzip
+        if cached is None or cached[0] != f'{etag}:gzip':
+            cached = (f'{etag}:gzip', gzip.compress(progress_json, 4))
+            self.progress_gzip = cached  # a single swap, like progress_payload
+        return cached
+    
+    def subscribe(self):
+        """Register an SSE listener; returns its queue and the current state"""
+        events = queue.Queue()
+        with self.subscribers_lock:
+            self.subscribers.add(events)
+        return events, self.progress_payload[0].decode()
+    
+    def unsubscribe(self, events):
+        with self.subscribers_lock:
+            self.subscribers.discard(events)
+    
+    def publish_progress(self):
+        """Push the current progress to everyone streaming this session"""
+        if self.push_notification:
+            webhook_pool.submit(self.send_push_notification, next(self.push_sequence), self.progress_payload[0])
+        
+        with self.subscribers_lock:
+            if not self.subscribers:
+                return
+            message = self.progress_payload[0].decode()
+            for events in self.subscribers:
+                events.put(message)
+    
+    def send_push_notification(self, sequence, progress_json):
+        """POST one progress update to the client's webhook, signed with its token
+        
+        Deliveries may arrive out of order; receivers should keep the highest sequence.
+        """
+        # Re-checked per delivery, so DNS can't be pointed inward after validation
+        url = self.push_notification['url']
+        if not (ALLOW_PRIVATE_WEBHOOKS or is_public_host(urlparse(url).hostname)):
+            print(f"⚠️  Push notification to {url} skipped: not a public address")
+            return
+        token = self.push_notification['token']
+        body = orjson.dumps({
+            'session_id': self.session_id,
+            'sequence': sequence,
+            'progress': orjson.loads(progress_json)
+        })
+        signature = hmac.new(token.encode('utf-8'), body, hashlib.sha256).hexdigest()
+        try:
+            webhook_session.post(
+                url,
+                data=body,
+                headers={
+                    'Content-Type': 'application/json',
+                    'Authorization': f'Bearer {token}',
+                    'X-ModSmith-Signature': f'sha256={signature}'
+                },
+                timeout=5,
+                allow_redirects=False  # a redirect could point back inside the network
+            )
+        except requests.RequestException as e:
+            print(f"⚠️  Push notification to {url} failed: {e}")
+    
+    def set_progress(self, **fields):
+        """Apply progress fields atomically and notify listeners"""
+        with self.progress_lock:
+            self.progress.update(fields)
+            self._serialize_progress()
+        self.publish_progress()
     
     def update_progress(self, step, step_name, percentage, details=None):
         """Update progress for web interface"""
-        self.progress.update({
-            'step': step,
-            'current_step': step_name,
-            'percentage': percentage,
-            'status': 'processing'
-        })
-        if details:
+        with self.progress_lock:
+            self.progress.update({
+                'step': step,
+                'current_step': step_name,
+                'percentage': percentage,
+                'status': 'processing'
+            })
+            if details:
+                self.progress['details'].append(details)
+            self._serialize_progress()
+        self.publish_progress()
+    
+    def add_progress_detail(self, details):
+        """Append a detail line without touching the step or status"""
+        with self.progress_lock:
             self.progress['details'].append(details)
+            self._serialize_progress()
+        self.publish_progress()
     
     def web_generate_modpack(self, mc_version, mod_loader, theme):
         """Generate modpack with web progress tracking"""
         try:
             self.update_progress(1, 'Initializing AI system...', 10)
-            time.sleep(1)  # Simulate processing time
             
             self.update_progress(2, 'Generating mod suggestions...', 30)
             mod_suggestions = self.generate_mod_suggestions(mc_version, mod_loader, theme)
@@ -71,27 +726,19 @@ class WebModGenerator(MinecraftModGenerator):
             
             self.update_progress(3, 'Validating mods against Modrinth...', 70)
             
-            # Store original mod count to track failures
-            original_suggestions = mod_suggestions.copy()
-            
             valid_mods = self.validate_mods(mod_suggestions, mc_version, mod_loader, theme)
             
             if not valid_mods:
                 raise Exception("No valid mods found")
             
-            # Calculate failed mods
-            valid_mod_names = {mod.name.lower() for mod in valid_mods}
-            failed_mods = []
+            # Validation knows exactly which suggestions failed to resolve; no name matching needed
+            failed_mods = list(self.unresolved_suggestions)
             
-            for suggestion in original_suggestions:
-                suggestion_lower = suggestion.lower()
-                # Check if this suggestion wasn't found in valid mods
-                if not any(suggestion_lower in valid_name or valid_name in suggestion_lower 
-                          for valid_name in valid_mod_names):
-                    failed_mods.append(suggestion)
+            self.valid_mods = valid_mods
             
             self.update_progress(4, 'Creating output files...', 90)
             self.generate_output_files(valid_mods, mc_version, mod_loader, theme)
+            self.capture_artifacts()
             
             self.update_progress(5, 'Completed successfully!', 100)
             
@@ -102,7 +749,7 @@ class WebModGenerator(MinecraftModGenerator):
                 'mcVersion': mc_version,
                 'modLoader': mod_loader,
                 'totalMods': len(valid_mods),
-                'successRate': round((len(valid_mods) / len(original_suggestions)) * 100) if original_suggestions else 0,
+                'successRate': round((len(valid_mods) / len(mod_suggestions)) * 100) if mod_suggestions else 0,
                 'mods': [
                     {
                         'name': mod.name,
@@ -116,79 +763,162 @@ class WebModGenerator(MinecraftModGenerator):
                 'generatedAt': time.strftime('%Y-%m-%d %H:%M:%S')
             }
             
-            self.progress['status'] = 'completed'
-            self.progress['result'] = result
+            # The result goes out once through /api/result, not with every progress update
+            self.result = result
+            self.result_json = orjson.dumps(result)
+            self.set_progress(status='completed')
+            self.release_working_state()
             
             return result
             
         except Exception as e:
-            self.progress['status'] = 'error'
-            self.progress['error'] = str(e)
+            self.set_progress(status='error', error=str(e))
             raise e
 
-    def download_mod_files_with_ferium(self, valid_mods, mc_version, mod_loader):
-        """Download mod files using Ferium directly into generated/gen-mods/ folder"""
-        import subprocess
-        from pathlib import Path
+    def capture_artifacts(self):
+        """Snapshot the output files (and their zip) for this session's downloads"""
+        generated_dir = Path("generated")
+        contents = {
+            file_type: (filename, (generated_dir / filename).read_bytes())
+            for file_type, filename in GENERATED_FILES.items()
+        }
+        contents['all'] = ('modpack-complete.zip', self.build_output_zip())
+        self.artifacts = {
+            file_type: (filename, data, hashlib.blake2b(data, digest_size=16).hexdigest())
+            for file_type, (filename, data) in contents.items()
+        }
+        self.artifacts_built = time.time()
+    
+    def build_output_zip(self):
+        """Zip this generation's output files for the 'all' download"""
+        zip_buffer = io.BytesIO()
+        # Small text files: level 1 is far cheaper and barely larger than the default
+        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zip_file:
+            for file_path in Path("generated").iterdir():
+                # Hidden files (the lookup cache) are internal, not part of the modpack
+                if file_path.suffix in ('.txt', '.json', '.md') and not file_path.name.startswith('.'):
+                    zip_file.write(file_path, file_path.name)
+        return zip_buffer.getvalue()
+    
+    def close(self):
+        """Free everything the session holds once it is evicted or cleaned up"""
+        for remove_temp_dir in list(self.temp_dir_cleanups):
+            remove_temp_dir()
+        self.temp_dir_cleanups.clear()
+        self.artifacts = {}
+        self.valid_mods = []
+        self.result = None
+        self.result_json = None
+        with self.subscribers_lock:
+            self.subscribers.clear()
+    
+    def release_working_state(self):
+        """Drop validation-only state once a session has its result
         
-        # Use generated/gen-mods directory for downloads (ensure absolute path for Ferium)
+        Sessions can stay around for an hour; only progress, the result and
+        valid_mods are needed to serve downloads after generation.
+        """
+        self.successful_mods.clear()
+        self.failed_mods.clear()
+        self.mod_display_names.clear()
+        self.gemini_false_suggestions.clear()
+        self.prefetched_lookups.clear()
+        self.learning_context_cache = (-1, "")
+
+    def create_ferium_profile(self, mc_version, mod_loader):
+        """Create a Ferium profile that downloads into generated/gen-mods/; returns its name"""
+        # Ferium needs an absolute output directory
         mods_dir = Path("generated/gen-mods").resolve()
         mods_dir.mkdir(parents=True, exist_ok=True)
         
+        # Create unique profile name
+        profile_name = f"{FERIUM_PROFILE_PREFIX}{self.session_id[:8]}-{int(time.time())}"
+        
+        # Create Ferium profile with explicit output directory
+        print(f"🔧 Creating Ferium profile: {profile_name}")
+        create_cmd = [
+            'ferium', 'profile', 'create',
+            '--game-version', mc_version,
+            '--mod-loader', mod_loader,
+            '--output-dir', str(mods_dir),  # Set explicit mods directory
+            '--name', profile_name
+        ]
+        
+        print(f"Running: {' '.join(create_cmd)}")
+        result = run_ferium(create_cmd, timeout=30)
+        if result.returncode != 0:
+            print(f"Create command stdout: {result.stdout}")
+            print(f"Create command stderr: {result.stderr}")
+            raise Exception(f"Failed to create Ferium profile: {result.stderr}")
+        
+        print(f"✅ Ferium profile created successfully")
+        print(f"Profile output: {result.stdout}")
+        return profile_name
+    
+    def download_mod_files_with_ferium(self, valid_mods, mc_version, mod_loader):
+        """Download mod files using Ferium directly into generated/gen-mods/ folder"""
+        mods_dir = Path("generated/gen-mods").resolve()
+        
+        profile_name = None
         try:
             print(f"📥 Downloading {len(valid_mods)} mods using Ferium...")
             print(f"📁 Download directory: {mods_dir}")
             
-            # Create unique profile name
-            profile_name = f"modsmith-web-{int(time.time())}"
-            
-            # Create Ferium profile with explicit output directory
-            print(f"🔧 Creating Ferium profile: {profile_name}")
-            create_cmd = [
-                'ferium', 'profile', 'create',
-                '--game-version', mc_version,
-                '--mod-loader', mod_loader,
-                '--output-dir', str(mods_dir),  # Set explicit mods directory
-                '--name', profile_name
-            ]
-            
-            print(f"Running: {' '.join(create_cmd)}")
-            result = subprocess.run(create_cmd, capture_output=True, text=True, timeout=30)
-            if result.returncode != 0:
-                print(f"Create command stdout: {result.stdout}")
-                print(f"Create command stderr: {result.stderr}")
-                raise Exception(f"Failed to create Ferium profile: {result.stderr}")
-            
-            print(f"✅ Ferium profile created successfully")
-            print(f"Profile output: {result.stdout}")
+            profile_name = self.create_ferium_profile(mc_version, mod_loader)
             
             # Switch to the new profile
             print(f"🔄 Switching to profile: {profile_name}")
             switch_cmd = ['ferium', 'profile', 'switch', profile_name]
-            result = subprocess.run(switch_cmd, capture_output=True, text=True, timeout=10)
+            result = run_ferium(switch_cmd, timeout=10)
             if result.returncode != 0:
                 print(f"Switch command stderr: {result.stderr}")
                 raise Exception(f"Failed to switch to Ferium profile: {result.stderr}")
             
-            # Add all mods to the profile
-            print(f"📦 Adding {len(valid_mods)} mods to Ferium profile...")
+            # Slugs Ferium rejected recently for this version and loader aren't retried
+            rejected = ferium_reject_cache.rejected((mod.slug for mod in valid_mods), mc_version, mod_loader)
+            mods_to_add = [mod for mod in valid_mods if mod.slug not in rejected]
+            for mod in valid_mods:
+                if mod.slug in rejected:
+                    print(f"    ⏭️  Skipping {mod.name}: Ferium rejected it recently")
+            
+            # Add all mods to the profile in one call; fall back to one call per mod
+            # so a single unknown slug doesn't sink the whole batch
+            print(f"📦 Adding {len(mods_to_add)} mods to Ferium profile...")
             successful_adds = 0
-            for i, mod in enumerate(valid_mods, 1):
-                try:
-                    print(f"[{i:2d}/{len(valid_mods):2d}] Adding: {mod.name}")
-                    
-                    add_cmd = ['ferium', 'add', mod.slug]
-                    result = subprocess.run(add_cmd, capture_output=True, text=True, timeout=15)
-                    
-                    if result.returncode == 0:
-                        print(f"    ✓ Added: {mod.name}")
-                        successful_adds += 1
-                    else:
-                        print(f"    ⚠️  Failed to add {mod.name}: {result.stderr.strip()}")
+            add_cmd = ['ferium', 'add', *(mod.slug for mod in mods_to_add)]
+            result = run_ferium(add_cmd, timeout=15 + 5 * len(mods_to_add)) if mods_to_add else None
+            if result is not None and result.returncode == 0:
+                successful_adds = len(mods_to_add)
+                print(f"    ✓ Added all {successful_adds} mods")
+            elif result is not None:
+                # Ferium keeps the ids that resolved even when the batch exits non-zero,
+                # so the retries below report those as already added
+                print(f"    ⚠️  Batch add failed, adding mods one by one: {result.stderr.strip()}")
+                for i, mod in enumerate(mods_to_add, 1):
+                    try:
+                        print(f"[{i:2d}/{len(mods_to_add):2d}] Adding: {mod.name}")
                         
-                except Exception as e:
-                    print(f"    ❌ Error adding {mod.name}: {e}")
-                    continue
+                        add_cmd = ['ferium', 'add', mod.slug]
+                        result = run_ferium(add_cmd, timeout=15)
+                        
+                        # Only a genuine rejection is remembered; mods the batch
+                        # already added are good slugs
+                        if result.returncode == 0:
+                            print(f"    ✓ Added: {mod.name}")
+                            successful_adds += 1
+                            ferium_reject_cache.record(mod.slug, mc_version, mod_loader, True)
+                        elif ferium_already_added(result):
+                            print(f"    ✓ Already added by the batch: {mod.name}")
+                            successful_adds += 1
+                            ferium_reject_cache.record(mod.slug, mc_version, mod_loader, True)
+                        else:
+                            print(f"    ⚠️  Failed to add {mod.name}: {result.stderr.strip()}")
+                            ferium_reject_cache.record(mod.slug, mc_version, mod_loader, False)
+                        
+                    except Exception as e:
+                        print(f"    ❌ Error adding {mod.name}: {e}")
+                        continue
+                ferium_reject_cache.save()
             
             if successful_adds == 0:
                 raise Exception("No mods were successfully added to Ferium profile")
@@ -198,7 +928,7 @@ class WebModGenerator(MinecraftModGenerator):
             # List profile to verify mods were added
             print(f"🔍 Verifying profile contents...")
             list_cmd = ['ferium', 'list']
-            result = subprocess.run(list_cmd, capture_output=True, text=True, timeout=10)
+            result = run_ferium(list_cmd, timeout=10)
             print(f"Profile contents:\n{result.stdout}")
             
             # Download all mods (including dependencies) with verbose output
@@ -206,82 +936,54 @@ class WebModGenerator(MinecraftModGenerator):
             download_cmd = ['ferium', 'upgrade']
             print(f"Running: {' '.join(download_cmd)}")
             
-            result = subprocess.run(download_cmd, capture_output=True, text=True, timeout=300)  # 5 minute timeout
+            # Each line Ferium prints reaches the client as a progress detail
+            def report(line):
+                print(f"    {line}")
+                if line.strip():
+                    self.add_progress_detail(line)
             
-            print(f"Ferium upgrade output:\n{result.stdout}")
-            if result.stderr:
-                print(f"Ferium upgrade stderr:\n{result.stderr}")
+            returncode = stream_ferium(download_cmd, timeout=300, on_line=report)  # 5 minute timeout
             
-            if result.returncode != 0:
-                print(f"⚠️  Ferium upgrade had issues (return code: {result.returncode})")
+            if returncode != 0:
+                print(f"⚠️  Ferium upgrade had issues (return code: {returncode})")
                 # Don't fail completely, some mods might still have downloaded
             
             # Check what was downloaded
             downloaded_files = []
+            downloaded_bytes = 0
             
             print(f"🔍 Checking for downloaded files in: {mods_dir}")
             if mods_dir.exists():
-                jar_files = list(mods_dir.glob('*.jar'))
-                print(f"Found {len(jar_files)} .jar files")
-                
-                for jar_file in jar_files:
-                    file_size = jar_file.stat().st_size
-                    downloaded_files.append({
-                        'filename': jar_file.name,
-                        'path': jar_file,
-                        'size': file_size
-                    })
-                    print(f"    ✓ Downloaded: {jar_file.name} ({file_size // 1024} KB)")
+                # One recursive walk; scandir hands back the entry type with the name,
+                # and DirEntry caches its stat
+                pending_dirs = [mods_dir]
+                while pending_dirs:
+                    with os.scandir(pending_dirs.pop()) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending_dirs.append(entry.path)
+                            elif entry.name.endswith('.jar') and entry.is_file():
+                                file_size = entry.stat().st_size
+                                downloaded_bytes += file_size
+                                downloaded_files.append({
+                                    'filename': entry.name,
+                                    'path': Path(entry.path),
+                                    'size': file_size
+                                })
+                                print(f"    ✓ Downloaded: {entry.name} ({file_size // 1024} KB)")
+                print(f"Found {len(downloaded_files)} .jar files")
+                # Totals from the same walk, so the client needn't ask for a listing
+                self.set_progress(downloaded_files=len(downloaded_files), downloaded_bytes=downloaded_bytes)
             else:
                 print(f"❌ Mods directory does not exist: {mods_dir}")
             
-            # Also check the mods directory root for any additional files
-            for jar_file in mods_dir.rglob('*.jar'):
-                if jar_file not in [f['path'] for f in downloaded_files]:
-                    file_size = jar_file.stat().st_size
-                    downloaded_files.append({
-                        'filename': jar_file.name,
-                        'path': jar_file,
-                        'size': file_size
-                    })
-                    print(f"    ✓ Found additional file: {jar_file.name} ({file_size // 1024} KB)")
-            
             print(f"✅ Ferium download complete: {len(downloaded_files)} files found in {mods_dir}")
             
-            # Clean up Ferium profile
-            try:
-                print(f"🧹 Cleaning up Ferium profile: {profile_name}")
-                # First switch to a different profile if it exists, then delete
-                list_result = subprocess.run(['ferium', 'profile', 'list'], capture_output=True, text=True, timeout=10)
-                if 'modsmith-web-' in list_result.stdout:
-                    # Try to switch to first available profile that's not ours, or create a dummy one
-                    try:
-                        subprocess.run(['ferium', 'profile', 'create', '--name', 'temp-cleanup', '--game-version', '1.20.1', '--mod-loader', 'forge'], capture_output=True, text=True, timeout=10)
-                        subprocess.run(['ferium', 'profile', 'switch', 'temp-cleanup'], capture_output=True, text=True, timeout=10)
-                    except:
-                        pass
-                
-                delete_cmd = ['ferium', 'profile', 'delete', profile_name, '--force']
-                delete_result = subprocess.run(delete_cmd, capture_output=True, text=True, timeout=10)
-                if delete_result.returncode == 0:
-                    print(f"✅ Cleaned up Ferium profile: {profile_name}")
-                else:
-                    print(f"⚠️  Could not delete profile: {delete_result.stderr}")
-                    
-                # Clean up temp profile too
-                try:
-                    subprocess.run(['ferium', 'profile', 'delete', 'temp-cleanup', '--force'], capture_output=True, text=True, timeout=10)
-                except:
-                    pass
-                    
-            except Exception as cleanup_error:
-                print(f"⚠️  Could not clean up Ferium profile: {cleanup_error}")
-            
             if not downloaded_files:
                 # Try to get more info about why nothing downloaded
                 print("🔍 Debug: Checking Ferium configuration...")
                 config_cmd = ['ferium', 'profile', 'list']
-                result = subprocess.run(config_cmd, capture_output=True, text=True, timeout=10)
+                result = run_ferium(config_cmd, timeout=10)
                 print(f"Ferium profiles: {result.stdout}")
                 
                 raise Exception("No mod files were downloaded by Ferium. This could be due to version compatibility issues or network problems.")
@@ -295,79 +997,39 @@ class WebModGenerator(MinecraftModGenerator):
         except Exception as e:
             print(f"❌ Error in Ferium download: {e}")
             raise Exception(f"Ferium download failed: {str(e)}")
+        finally:
+            if profile_name:
+                # Queued behind this job on the Ferium pool, so the result is reported first
+                ferium_pool.submit(delete_ferium_profile, profile_name)
 
     def download_mod_files(self, valid_mods, mc_version, mod_loader):
         """Download actual mod .jar files from Modrinth"""
         downloaded_files = []
-        temp_dir = Path(tempfile.mkdtemp(prefix='modsmith_mods_'))
+        temp_dir = make_scratch_dir('modsmith_mods_')
         
         try:
             print(f"📥 Downloading {len(valid_mods)} mod files...")
             
-            for i, mod in enumerate(valid_mods, 1):
-                try:
-                    print(f"[{i:2d}/{len(valid_mods):2d}] Downloading: {mod.name}")
-                    
-                    # Get mod versions from Modrinth
-                    versions_url = f"https://api.modrinth.com/v2/project/{mod.slug}/version"
-                    params = {
-                        'game_versions': f'["{mc_version}"]',
-                        'loaders': f'["{mod_loader}"]'
-                    }
-                    
-                    response = requests.get(versions_url, params=params, timeout=10)
-                    if response.status_code != 200:
-                        print(f"    ⚠️  Failed to get versions for {mod.name}")
-                        continue
-                    
-                    versions = response.json()
-                    if not versions:
-                        print(f"    ⚠️  No compatible versions found for {mod.name}")
-                        continue
-                    
-                    # Get the latest version
-                    latest_version = versions[0]
-                    
-                    # Find the primary file (usually the main mod file)
-                    primary_file = None
-                    for file_info in latest_version.get('files', []):
-                        if file_info.get('primary', False):
-                            primary_file = file_info
-                            break
-                    
-                    # If no primary file, use the first file
-                    if not primary_file and latest_version.get('files'):
-                        primary_file = latest_version['files'][0]
-                    
-                    if not primary_file:
-                        print(f"    ⚠️  No download file found for {mod.name}")
+            # Downloads are network-bound; the pooled session keeps connections alive between them
+            with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+                futures = {
+                    pool.submit(self._fetch_one, mod, mc_version, mod_loader, temp_dir): mod
+                    for mod in valid_mods
+                }
+                for i, future in enumerate(as_completed(futures), 1):
+                    mod = futures[future]
+                    try:
+                        file_entry = future.result()
+                    except Exception as e:
+                        print(f"[{i:2d}/{len(valid_mods):2d}] ❌ Error downloading {mod.name}: {e}")
                         continue
                     
-                    # Download the file
-                    download_url = primary_file['url']
-                    filename = primary_file['filename']
-                    
-                    file_response = requests.get(download_url, timeout=30)
-                    if file_response.status_code == 200:
-                        file_path = temp_dir / filename
-                        with open(file_path, 'wb') as f:
-                            f.write(file_response.content)
-                        
-                        downloaded_files.append({
-                            'mod': mod,
-                            'filename': filename,
-                            'path': file_path,
-                            'size': len(file_response.content)
-                        })
-                        print(f"    ✓ Downloaded: {filename} ({len(file_response.content) // 1024} KB)")
-                    else:
-                        print(f"    ⚠️  Failed to download {mod.name}")
-                        
-                except Exception as e:
-                    print(f"    ❌ Error downloading {mod.name}: {e}")
-                    continue
+                    if file_entry:
+                        downloaded_files.append(file_entry)
+                        print(f"[{i:2d}/{len(valid_mods):2d}] ✓ Downloaded: {file_entry['filename']} ({file_entry['size'] // 1024} KB)")
             
             print(f"✓ Successfully downloaded {len(downloaded_files)} out of {len(valid_mods)} mods")
+            jar_cache.evict()
             return downloaded_files, temp_dir
             
         except Exception as e:
@@ -376,11 +1038,101 @@ class WebModGenerator(MinecraftModGenerator):
             if temp_dir.exists():
                 shutil.rmtree(temp_dir)
             return [], None
+    
+    def get_mod_versions(self, mod, mc_version, mod_loader):
+        """Compatible versions of a mod, newest first (None if Modrinth refused)"""
+        cache_key = (mod.slug, mc_version, mod_loader)
+        versions = versions_cache.get(cache_key)
+        if versions is not None:
+            return versions
+        
+        # Get mod versions from Modrinth
+        versions_url = f"{self.modrinth_base_url}/project/{mod.slug}/version"
+        params = {
+            'game_versions': f'["{mc_version}"]',
+            'loaders': f'["{mod_loader}"]',
+            # Changelogs dominate the payload and are never shown
+            'include_changelog': 'false'
+        }
+        
+        response = self.session.get(versions_url, params=params, timeout=10)
+        if response.status_code != 200:
+            return None
+        
+        versions = response.json()
+        versions_cache.put(cache_key, versions)
+        return versions
+    
+    def _fetch_one(self, mod, mc_version, mod_loader, temp_dir):
+        """Download the newest compatible file for one mod, or return None"""
+        versions = self.get_mod_versions(mod, mc_version, mod_loader)
+        if versions is None:
+            print(f"    ⚠️  Failed to get versions for {mod.name}")
+            return None
+        if not versions:
+            print(f"    ⚠️  No compatible versions found for {mod.name}")
+            return None
+        
+        # Get the latest version
+        latest_version = versions[0]
+        
+        # Find the primary file (usually the main mod file), else use the first file
+        files = latest_version.get('files', [])
+        primary_file = next((file_info for file_info in files if file_info.get('primary', False)), None)
+        if not primary_file and files:
+            primary_file = files[0]
+        
+        if not primary_file:
+            print(f"    ⚠️  No download file found for {mod.name}")
+            return None
+        
+        filename = primary_file['filename']
+        file_path = temp_dir / filename
+        sha1 = primary_file.get('hashes', {}).get('sha1')
+        
+        if not (sha1 and jar_cache.link_into(sha1, file_path)):
+            # Stream the jar to disk rather than holding it in memory
+            # Jars are already compressed, so skip content negotiation for gzip
+            with self.session.get(primary_file['url'], stream=True, timeout=30,
+                                  headers={'Accept-Encoding': 'identity'}) as file_response:
+                if file_response.status_code != 200:
+                    print(f"    ⚠️  Failed to download {mod.name}")
+                    return None
+                if sha1:
+                    jar_cache.store(file_response, sha1, file_path)
+                else:
+                    with open(file_path, 'wb') as f:
+                        for chunk in file_response.iter_content(chunk_size=ZIP_CHUNK_SIZE):
+                            f.write(chunk)
+        
+        return {
+            'mod': mod,
+            'filename': filename,
+            'path': file_path,
+            'size': file_path.stat().st_size
+        }
+
+@app.after_request
+def cache_static_assets(response):
+    """Let browsers keep static assets for an hour instead of re-fetching them"""
+    if request.endpoint == 'static':
+        response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
+
+def index_response():
+    """The SPA shell, gzipped when the client allows it, with a 304 for revalidations"""
+    headers = {'ETag': f'"{INDEX_HTML_ETAG}"', 'Vary': 'Accept-Encoding'}
+    if request.if_none_match.contains(INDEX_HTML_ETAG):
+        return Response(status=304, headers=headers)
+    if 'gzip' in request.accept_encodings:
+        headers['Content-Encoding'] = 'gzip'
+        return Response(INDEX_HTML_GZIP, mimetype='text/html', headers=headers)
+    return Response(INDEX_HTML_BYTES, mimetype='text/html', headers=headers)
 
 @app.route('/')
 def index():
     """Serve the main web interface"""
-    return send_file('web/index.html')
+    return index_response()
 
 @app.route('/api/generate', methods=['POST'])
 def generate_modpack():
@@ -394,11 +1146,26 @@ def generate_modpack():
             if not data.get(field):
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
+        # Headless clients can have progress POSTed to them instead of polling
+        push_notification = data.get('pushNotification')
+        if push_notification is not None:
+            if not isinstance(push_notification, dict):
+                return jsonify({'error': 'pushNotification must be an object'}), 400
+            push_url = urlparse(str(push_notification.get('url', '')))
+            if push_url.scheme not in ('http', 'https') or not push_url.hostname:
+                return jsonify({'error': 'pushNotification.url must be an http(s) URL'}), 400
+            if not (ALLOW_PRIVATE_WEBHOOKS or is_public_host(push_url.hostname)):
+                return jsonify({'error': 'pushNotification.url must be a public address'}), 400
+            token = push_notification.get('token', '')
+            if not isinstance(token, str):
+                return jsonify({'error': 'pushNotification.token must be a string'}), 400
+            push_notification = {'url': push_url.geturl(), 'token': token}
+        
         # Create unique session ID
         session_id = f"session_{int(time.time() * 1000)}"
         
         # Create generator instance
-        generator = WebModGenerator(session_id)
+        generator = WebModGenerator(session_id, push_notification)
         
         # Start generation in background thread
         def generate():
@@ -411,9 +1178,7 @@ def generate_modpack():
             except Exception as e:
                 print(f"Generation error: {e}")
         
-        thread = threading.Thread(target=generate)
-        thread.daemon = True
-        thread.start()
+        generation_pool.submit(generate)
         
         return jsonify({
             'success': True,
@@ -428,65 +1193,156 @@ def generate_modpack():
 def get_progress(session_id):
     """Get generation progress"""
     try:
-        if session_id not in active_sessions:
+        generator = active_sessions.get(session_id)
+        if generator is None:
             return jsonify({'error': 'Session not found'}), 404
         
-        generator = active_sessions[session_id]
-        return jsonify(generator.progress)
+        # Serialized (and gzipped) once per change; pollers that already have it get
+        # an empty 304. The gzip variant has its own "<etag>:gzip" tag.
+        body, etag = generator.progress_payload
+        headers = {'Vary': 'Accept-Encoding', 'Cache-Control': 'no-cache'}  # always revalidate
+        for known_etag in (etag, f'{etag}:gzip'):
+            if request.if_none_match.contains(known_etag):
+                return Response(status=304, headers={**headers, 'ETag': f'"{known_etag}"'})
+        
+        if 'gzip' in request.accept_encodings and len(body) >= app.config['COMPRESS_MIN_SIZE']:
+            etag, body = generator.gzipped_progress()
+            headers['Content-Encoding'] = 'gzip'
+        response = Response(body, mimetype='application/json', headers=headers)
+        response.set_etag(etag)
+        return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/progress/<session_id>/stream')
+def stream_progress(session_id):
+    """Stream generation progress as Server-Sent Events"""
+    generator = active_sessions.get(session_id)
+    if generator is None:
+        return jsonify({'error': 'Session not found'}), 404
+    
+    def events():
+        # Every stream gets its own queue, starting from the current state
+        subscription, message = generator.subscribe()
+        try:
+            while True:
+                yield f"data: {message}\n\n"
+                progress = orjson.loads(message)
+                # A finished session stays open while a Ferium download is running
+                if (progress.get('status') in ('completed', 'error')
+                        and progress.get('ferium_status') != 'downloading'):
+                    return
+                while True:
+                    try:
+                        message = subscription.get(timeout=SSE_HEARTBEAT_SECONDS)
+                        break
+                    except queue.Empty:
+                        # Comment line keeps proxies from closing an idle stream
+                        yield ": keepalive\n\n"
+        finally:
+            generator.unsubscribe(subscription)
+    
+    return Response(
+        events(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/result/<session_id>')
+@compress.compressed()
+def get_result(session_id):
+    """Get the finished modpack (mod list, failed suggestions, stats)"""
+    generator = active_sessions.get(session_id)
+    if generator is None:
+        return jsonify({'error': 'Session not found'}), 404
+    if generator.result_json is None:
+        return jsonify({'error': 'Generation not completed'}), 400
+    return Response(generator.result_json, mimetype='application/json')
+
 @app.route('/api/download/<session_id>/<file_type>')
 def download_file(session_id, file_type):
     """Download generated files"""
     try:
-        if session_id not in active_sessions:
+        generator = active_sessions.get(session_id)
+        if generator is None:
             return jsonify({'error': 'Session not found'}), 404
         
-        generator = active_sessions[session_id]
-        
         if generator.progress['status'] != 'completed':
             return jsonify({'error': 'Generation not completed'}), 400
         
-        generated_dir = Path("generated")
+        if file_type in generator.artifacts:
+            # Conditional responses let browsers revalidate (304) or resume (206) downloads.
+            # A session's artifacts never change, so the browser may also keep them a while.
+            filename, data, etag = generator.artifacts[file_type]
+            response = send_file(
+                io.BytesIO(data),
+                as_attachment=True,
+                download_name=filename,
+                conditional=True,
+                etag=etag,
+                last_modified=generator.artifacts_built
+            )
+            response.headers['Cache-Control'] = 'private, max-age=3600'
+            return response
         
-        if file_type == 'mods':
-            # Return gen-mods.txt
-            file_path = generated_dir / 'gen-mods.txt'
-            if file_path.exists():
-                return send_file(file_path, as_attachment=True, download_name='gen-mods.txt')
-        
-        elif file_type == 'details':
-            # Return modpack-details.json
-            file_path = generated_dir / 'modpack-details.json'
-            if file_path.exists():
-                return send_file(file_path, as_attachment=True, download_name='modpack-details.json')
-        
-        elif file_type == 'summary':
-            # Return modpack-summary.md
-            file_path = generated_dir / 'modpack-summary.md'
-            if file_path.exists():
-                return send_file(file_path, as_attachment=True, download_name='modpack-summary.md')
-        
-        elif file_type == 'all':
-            # Create zip with all files
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                for file_path in generated_dir.glob('*.txt'):
-                    zip_file.write(file_path, file_path.name)
-                for file_path in generated_dir.glob('*.json'):
-                    zip_file.write(file_path, file_path.name)
-                for file_path in generated_dir.glob('*.md'):
-                    zip_file.write(file_path, file_path.name)
+        elif file_type == 'mod-files':
+            result = generator.result
+            download_name = secure_filename(f"modpack-{result['theme']}-{result['mcVersion']}.zip")
             
-            zip_buffer.seek(0)
-            return send_file(
-                io.BytesIO(zip_buffer.read()),
-                mimetype='application/zip',
-                as_attachment=True,
-                download_name='modpack-complete.zip'
+            # Identical modpacks (same mods, version, loader and theme) share one archive
+            cache_key = zip_cache.key_for(
+                sorted(mod.slug for mod in generator.valid_mods),
+                result['mcVersion'], result['modLoader'], result['theme']
             )
+            cached_zip = zip_cache.lookup(cache_key)
+            if cached_zip:
+                return send_file(
+                    cached_zip, mimetype='application/zip', as_attachment=True,
+                    download_name=download_name, conditional=True
+                )
+            
+            # Download the .jar files and stream them out as a zip
+            downloaded_files, temp_dir = generator.download_mod_files(
+                generator.valid_mods, result['mcVersion'], result['modLoader']
+            )
+            if not downloaded_files:
+                return jsonify({'error': 'No mod files could be downloaded'}), 502
+            
+            info_content = (
+                f"{result['theme']} Modpack\n"
+                f"Minecraft Version: {result['mcVersion']}\n"
+                f"Mod Loader: {result['modLoader']}\n"
+                f"Mods: {len(downloaded_files)}\n\n"
+                "Copy the files in mods/ into your Minecraft mods folder.\n"
+            )
+            # Jars are already deflate-compressed, so store them as-is
+            entries = [
+                (f"mods/{file_entry['filename']}", file_entry['path'], zipfile.ZIP_STORED)
+                for file_entry in downloaded_files
+            ]
+            entries.append(('README.txt', info_content.encode('utf-8'), zipfile.ZIP_DEFLATED))
+            
+            chunks = iter_zip(entries)
+            if len(downloaded_files) == len(generator.valid_mods):
+                # Saved to the cache as it goes out, if the client reads to the end;
+                # partial modpacks are not cached so a retry can fill the gaps
+                chunks = zip_cache.tee(cache_key, chunks)
+            
+            def stream():
+                try:
+                    yield from chunks
+                finally:
+                    remove_temp_dir()
+                    generator.temp_dir_cleanups.discard(remove_temp_dir)
+            
+            # Also cleans up if the client goes away before the stream is ever started
+            response_stream = stream()
+            remove_temp_dir = weakref.finalize(response_stream, shutil.rmtree, temp_dir, ignore_errors=True)
+            generator.temp_dir_cleanups.add(remove_temp_dir)
+            response = Response(response_stream, mimetype='application/zip')
+            response.headers.set('Content-Disposition', 'attachment', filename=download_name)
+            return response
         
         return jsonify({'error': 'File not found'}), 404
         
@@ -497,16 +1353,15 @@ def download_file(session_id, file_type):
 def start_ferium_download(session_id):
     """Start Ferium download process"""
     try:
-        if session_id not in active_sessions:
+        generator = active_sessions.get(session_id)
+        if generator is None:
             return jsonify({'error': 'Session not found'}), 404
         
-        generator = active_sessions[session_id]
-        
         if generator.progress['status'] != 'completed':
             return jsonify({'error': 'Generation not completed'}), 400
         
         # Get the result data
-        result = generator.progress.get('result')
+        result = generator.result
         if not result:
             return jsonify({'error': 'No result data available'}), 400
         
@@ -552,21 +1407,19 @@ def start_ferium_download(session_id):
                 print(f"✅ Ferium download completed: Success = {success}")
                 
                 # Update progress with download result
-                generator.progress['ferium_status'] = 'completed' if success else 'failed'
-                generator.progress['ferium_success'] = success
+                generator.set_progress(
+                    ferium_status='completed' if success else 'failed',
+                    ferium_success=success
+                )
                 
             except Exception as e:
                 print(f"❌ Error in Ferium download thread: {e}")
                 import traceback
                 traceback.print_exc()
-                generator.progress['ferium_status'] = 'error'
-                generator.progress['ferium_error'] = str(e)
-        
-        thread = threading.Thread(target=start_download)
-        thread.daemon = True
-        thread.start()
+                generator.set_progress(ferium_status='error', ferium_error=str(e))
         
-        generator.progress['ferium_status'] = 'downloading'
+        generator.set_progress(ferium_status='downloading')
+        ferium_pool.submit(start_download)
         
         return jsonify({
             'success': True,
@@ -580,8 +1433,7 @@ def start_ferium_download(session_id):
 def cleanup_session(session_id):
     """Clean up session data"""
     try:
-        if session_id in active_sessions:
-            del active_sessions[session_id]
+        active_sessions.discard(session_id)
         
         return jsonify({'success': True, 'message': 'Session cleaned up'})
         
@@ -603,7 +1455,7 @@ def get_download_path():
 
 @app.errorhandler(404)
 def not_found(error):
-    return send_file('web/index.html')
+    return index_response()
 
 if __name__ == '__main__':
     print("🚀 Starting ModSmith Web Server...")
@@ -611,4 +1463,15 @@ if __name__ == '__main__':
     print("🔧 API Endpoints: http://localhost:5000/api/")
     print("✨ Features: Real-time progress, Ferium integration, File downloads")
     
-    app.run(host='0.0.0.0', port=5000, debug=True, threaded=True)
+    # Ferium profiles are global to the user; don't let ours pile up across restarts
+    ferium_pool.submit(delete_stale_ferium_profiles)
+    atexit.register(delete_stale_ferium_profiles)
+    
+    if os.getenv('FLASK_DEBUG') == '1':
+        # Development only: auto-reload and the interactive debugger
+        app.run(host='0.0.0.0', port=5000, debug=True, threaded=True)
+    else:
+        # Production WSGI server. Sessions live in this process, so any other server
+        # must also run a single worker (e.g. gunicorn -k gthread -w 1 --threads 32).
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=5000, threads=32)